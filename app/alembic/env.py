@@ -11,7 +11,9 @@ from alembic import context
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 # Import our models
-from app.models import Base
+from app.models import Base, load_all
+
+load_all()
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,50 @@
+"""Store player corporate class as a string with a CHECK constraint
+
+Revision ID: 10f03ea80b4d
+Revises: 780984af2df3
+Create Date: 2026-10-16 15:20:41.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '10f03ea80b4d'
+down_revision: Union[str, Sequence[str], None] = '780984af2df3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The enum stored member names, the string column stores CorporateClass values
+corporate_class_enum = sa.Enum('HR_MANAGER', 'PR_MANAGER', 'ASSET_MANAGER', 'WELLNESS_MANAGER', name='corporateclass')
+corporate_class_check = "corporate_class IN ('hr_manager', 'pr_manager', 'asset_manager', 'wellness_manager')"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.alter_column('corporate_class',
+               existing_type=corporate_class_enum,
+               type_=sa.String(length=32),
+               existing_nullable=False,
+               postgresql_using='lower(corporate_class::text)')
+    op.execute("UPDATE players SET corporate_class = lower(corporate_class)")
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.create_check_constraint('ck_players_corporate_class', corporate_class_check)
+    corporate_class_enum.drop(op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    corporate_class_enum.create(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.drop_constraint('ck_players_corporate_class', type_='check')
+    op.execute("UPDATE players SET corporate_class = upper(corporate_class)")
+    with op.batch_alter_table('players') as batch_op:
+        batch_op.alter_column('corporate_class',
+               existing_type=sa.String(length=32),
+               type_=corporate_class_enum,
+               existing_nullable=False,
+               postgresql_using='corporate_class::corporateclass')
@@ -1,27 +1,41 @@
 from datetime import datetime, timedelta
 from typing import Optional
+import threading
+import time
 from jose import jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, raiseload
 from fastapi import HTTPException, status, Depends, Cookie
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from .models.user import Player
+from .models.user import Player, CorporateClass
+from .models.guild import Guild
+from .models.game_session import GameSession
 from .models.database import get_db
+from .core.config import get_settings
 
 # Configuration
 SECRET_KEY = "your-secret-key-change-in-production"  # TODO: Move to environment variables
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 2 * 60  # 2 hours for development
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing - new hashes use argon2; bcrypt is kept only to verify
+# existing hashes, which are upgraded to argon2 on the next successful login
+pwd_context = CryptContext(schemes=["argon2", "bcrypt"], deprecated="auto")
 
 # Token bearer
 security = HTTPBearer(auto_error=False)
 
+# Verified session tokens -> player id. A dashboard load fires several HTMX
+# fragment requests with the same cookie; caching briefly lets them skip the
+# JWT signature check. Entries never outlive the token's own expiry.
+TOKEN_CACHE_TTL_SECONDS = 30
+TOKEN_CACHE_MAX_SIZE = 4096
+_token_cache: dict[str, tuple[float, str]] = {}
+_token_cache_lock = threading.Lock()
+
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
+    """Hash a password using argon2"""
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -48,13 +62,46 @@ def verify_token(token: str) -> Optional[dict]:
     except jwt.JWTError:
         return None
 
+def get_player_id_from_token(token: str) -> Optional[str]:
+    """Resolve a session token to a player id, caching successful verifications"""
+    now = time.monotonic()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    payload = verify_token(token)
+    player_id = payload.get("sub") if payload else None
+    if not player_id:
+        invalidate_session_token(token)
+        return None
+    
+    ttl = min(TOKEN_CACHE_TTL_SECONDS, payload["exp"] - time.time())
+    with _token_cache_lock:
+        if token not in _token_cache and len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del _token_cache[next(iter(_token_cache))]
+        _token_cache[token] = (now + ttl, player_id)
+    return player_id
+
+def invalidate_session_token(token: str) -> None:
+    """Drop a session token from the verification cache (e.g. on logout)"""
+    with _token_cache_lock:
+        _token_cache.pop(token, None)
+
 def authenticate_player(db: Session, email: str, password: str) -> Optional[Player]:
     """Authenticate a player with email and password"""
     player = db.query(Player).filter(Player.email == email).first()
     if not player:
         return None
-    if not verify_password(password, player.hashed_password):
+    
+    verified, new_hash = pwd_context.verify_and_update(password, player.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Legacy bcrypt hash - store the argon2 replacement
+        player.hashed_password = new_hash
+        db.commit()
     return player
 
 def get_current_player_from_cookie(
@@ -65,15 +112,26 @@ def get_current_player_from_cookie(
     if not session_token:
         return None
     
-    payload = verify_token(session_token)
-    if not payload:
-        return None
-    
-    player_id = payload.get("sub")
+    player_id = get_player_id_from_token(session_token)
     if not player_id:
         return None
     
-    player = db.query(Player).filter(Player.id == int(player_id)).first()
+    # Every page reads the session, the guild and its roster (sidebar adventurer
+    # count), so load them with the player: one joined query plus one for adventurers.
+    # GameSession.guild is the same row, read by advance_week()
+    options = [
+        joinedload(Player.game_session).joinedload(GameSession.guild),
+        joinedload(Player.guild).selectinload(Guild.adventurers),
+    ]
+    if get_settings().raise_on_lazy_load:
+        # Surface any other lazy load from the player or guild as an error (RAISE_ON_LAZY_LOAD=1)
+        options += [
+            raiseload("*", sql_only=True),
+            joinedload(Player.game_session).raiseload("*", sql_only=True),
+            joinedload(Player.guild).raiseload("*", sql_only=True),
+        ]
+    
+    player = db.query(Player).options(*options).filter(Player.id == int(player_id)).first()
     return player
 
 def get_current_player_required(
@@ -118,7 +176,6 @@ def create_player(
             )
     
     # Create new player
-    from .models.user import CorporateClass
     hashed_password = hash_password(password)
     
     player = Player(
@@ -126,7 +183,7 @@ def create_player(
         username=username,
         hashed_password=hashed_password,
         display_name=display_name,
-        corporate_class=CorporateClass(corporate_class)
+        corporate_class=CorporateClass(corporate_class).value
     )
     
     db.add(player)
@@ -134,7 +191,6 @@ def create_player(
     db.refresh(player)
     
     # Create game session for the new player
-    from .models.game_session import GameSession
     game_session = GameSession(
         player_id=player.id
     )
@@ -144,7 +200,6 @@ def create_player(
     db.refresh(game_session)
     
     # Create guild for the new player within their game session
-    from .models.guild import Guild
     guild = Guild(
         name=guild_name,
         owner_id=player.id,
@@ -1,8 +1,29 @@
-from .database import Base, engine, SessionLocal, get_db
-from .user import Player, CorporateClass
-from .guild import Guild
-from .game_session import GameSession
-from .adventurer import Adventurer, Skill, Trait, AdventurerClass, AdventurerSeniority, AdventurerRole
+"""
+Models are imported lazily (PEP 562): `from app.models import Skill` only
+imports the module that defines it. Call load_all() before configuring
+mappers or using Base.metadata so every model is registered.
+"""
+from importlib import import_module
+from sqlalchemy.orm import configure_mappers
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "Base": "database",
+    "engine": "database",
+    "SessionLocal": "database",
+    "get_db": "database",
+    "Player": "user",
+    "CorporateClass": "user",
+    "Guild": "guild",
+    "GameSession": "game_session",
+    "Adventurer": "adventurer",
+    "Skill": "adventurer",
+    "SkillClassRestriction": "adventurer",
+    "Trait": "adventurer",
+    "AdventurerClass": "adventurer",
+    "AdventurerSeniority": "adventurer",
+    "AdventurerRole": "adventurer",
+}
 
 __all__ = [
     "Base",
@@ -15,8 +36,25 @@ __all__ = [
     "GameSession",
     "Adventurer",
     "Skill",
+    "SkillClassRestriction",
     "Trait",
     "AdventurerClass",
     "AdventurerSeniority",
-    "AdventurerRole"
-]
\ No newline at end of file
+    "AdventurerRole",
+    "load_all"
+]
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+def load_all():
+    """Import every model module and configure the mappers up front"""
+    for module_name in set(_EXPORTS.values()):
+        import_module(f".{module_name}", __name__)
+    # Resolve relationships now rather than on the first query of the first request
+    configure_mappers()
@@ -1,10 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Text, Table
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, ForeignKey, Boolean, Text, Table, Index
+from sqlalchemy.orm import relationship, deferred
+from sqlalchemy.sql import func, text
 from enum import Enum as PyEnum
 import random
 from .database import Base
 
+# Combat positions (1=front, 2=mid-front, 3=mid-back, 4=back) are stored as a
+# bitmask: bit (n - 1) is set when position n is included
+ALL_POSITIONS = 0b1111
+
+def positions_mask(*positions):
+    """Encode combat positions (1-4) as a position bitmask"""
+    mask = 0
+    for position in positions:
+        mask |= 1 << (position - 1)
+    return mask
+
+def mask_positions(mask):
+    """Decode a position bitmask into the list of positions (1-4) it contains"""
+    return [position for position in range(1, 5) if mask & (1 << (position - 1))]
+
 # Association tables for many-to-many relationships
 adventurer_skills = Table(
     'adventurer_skills', Base.metadata,
@@ -24,27 +39,31 @@ class Skill(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True)
-    description = Column(Text, nullable=False)
+    description = deferred(Column(Text, nullable=False), group="details")  # Only shown on the adventurer profile
     skill_type = Column(String, nullable=False)  # 'offensive', 'defensive', 'utility', 'healing'
-    cooldown = Column(Integer, default=0)  # Turns between uses (0 = no cooldown)
-    
-    # Class restrictions (None = available to all)
-    restricted_to_classes = Column(String, nullable=True)  # Comma-separated class names, or None
+    cooldown = Column(SmallInteger, default=0)  # Turns between uses (0 = no cooldown)
     
     # Darkest Dungeon-style position system
-    usable_positions = Column(String, nullable=False, default="1,2,3,4")  # Comma-separated positions (1=front, 2=mid-front, 3=mid-back, 4=back)
+    usable_positions = Column(SmallInteger, nullable=False, default=ALL_POSITIONS)  # Position bitmask (see positions_mask)
     target_type = Column(String, nullable=False, default="enemy")  # 'enemy', 'ally', 'any', 'self'
-    target_positions = Column(String, nullable=True)  # Which positions this skill can target (None = any position of target_type)
+    target_positions = Column(SmallInteger, nullable=True)  # Position bitmask this skill can target (None = any position of target_type)
     
     # Relationships
     adventurers = relationship("Adventurer", secondary=adventurer_skills, back_populates="skills")
+    # Class restrictions (none = available to all)
+    class_restrictions = relationship("SkillClassRestriction", back_populates="skill", cascade="all, delete-orphan")
     
     def __repr__(self):
-        return f"<Skill(id={self.id}, name='{self.name}', type='{self.skill_type}', positions='{self.usable_positions}', targets='{self.target_type}')>"
+        return f"<Skill(id={self.id}, name='{self.name}', type='{self.skill_type}', positions={mask_positions(self.usable_positions)}, targets='{self.target_type}')>"
+    
+    @property
+    def restricted_classes(self):
+        """Adventurer classes allowed to use this skill (empty = available to all)"""
+        return [restriction.adventurer_class for restriction in self.class_restrictions]
     
     def can_use_from_position(self, position):
         """Check if skill can be used from specific position (1-4)"""
-        return str(position) in self.usable_positions.split(',')
+        return bool(self.usable_positions & (1 << (position - 1)))
     
     def can_target_position(self, position, target_type=None):
         """Check if skill can target specific position (1-4)"""
@@ -52,7 +71,7 @@ class Skill(Base):
             return False
         if not self.target_positions:
             return True  # Can target any position of correct type
-        return str(position) in self.target_positions.split(',')
+        return bool(self.target_positions & (1 << (position - 1)))
     
     def get_valid_targets(self):
         """Get description of what this skill can target"""
@@ -64,21 +83,34 @@ class Skill(Base):
         }
         return target_desc.get(self.target_type, 'Unknown')
 
+class SkillClassRestriction(Base):
+    """Adventurer class allowed to use a class-restricted skill"""
+    __tablename__ = "skill_class_restrictions"
+    
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    adventurer_class = Column(String, primary_key=True, index=True)  # AdventurerClass enum value
+    
+    # Relationships
+    skill = relationship("Skill", back_populates="class_restrictions")
+    
+    def __repr__(self):
+        return f"<SkillClassRestriction(skill_id={self.skill_id}, class='{self.adventurer_class}')>"
+
 class Trait(Base):
     """Passive traits that provide bonuses and penalties in combat and outside combat"""
     __tablename__ = "traits"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, unique=True)
-    description = Column(Text, nullable=False)
+    description = deferred(Column(Text, nullable=False), group="details")  # Only shown on the adventurer profile
     trait_type = Column(String, nullable=False)  # 'combat', 'economic', 'social', 'training'
     
     # Effect values (can be positive or negative)
-    bonus_value = Column(Integer, default=0)  # Percentage or flat bonus (negative values = penalties)
+    bonus_value = Column(SmallInteger, default=0)  # Percentage or flat bonus (negative values = penalties)
     bonus_type = Column(String, nullable=True)  # 'percentage', 'flat', 'special'
     
     # Additional effect for complex traits with both positive and negative aspects
-    penalty_value = Column(Integer, default=0)  # Additional penalty value for balanced traits
+    penalty_value = Column(SmallInteger, default=0)  # Additional penalty value for balanced traits
     penalty_type = Column(String, nullable=True)  # What the penalty affects
     
     # Trait classification
@@ -140,12 +172,22 @@ class AdventurerRole(PyEnum):
 class Adventurer(Base):
     """Bot characters with fantasy RPG classes that players can recruit"""
     __tablename__ = "adventurers"
+    __table_args__ = (
+        # Recruitment pool lookups only ever ask for available adventurers, so
+        # index just those rows; hired adventurers stay out of the index
+        Index(
+            "ix_adventurers_session_available",
+            "game_session_id",
+            postgresql_where=text("is_available = true"),
+            sqlite_where=text("is_available = 1"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
     # Identity & Ownership
     name = Column(String, nullable=False)  # Generated fantasy names
-    guild_id = Column(Integer, ForeignKey("guilds.id"), nullable=True)  # NULL for available adventurers
+    guild_id = Column(Integer, ForeignKey("guilds.id"), nullable=True, index=True)  # NULL for available adventurers
     game_session_id = Column(Integer, ForeignKey("game_sessions.id"), nullable=False)  # Session isolation
     
     # RPG Class & Progression
@@ -163,16 +205,16 @@ class Adventurer(Base):
     luck = Column(Integer, default=10)        # Fortune and critical success chance
     
     # Condition Stats (Uma Musume Style)
-    morale = Column(Integer, default=75)      # Mood/happiness (0-100)
-    stamina = Column(Integer, default=100)    # Energy for training/dungeons (0-100)
+    morale = Column(SmallInteger, default=75)      # Mood/happiness (0-100)
+    stamina = Column(SmallInteger, default=100)    # Energy for training/dungeons (0-100)
     
     # Fire Emblem-Style Growth Rates for Training (Percentages, can exceed 100%)
-    hp_growth = Column(Integer, default=80)       # % chance to gain HP during training
-    drive_growth = Column(Integer, default=60)    # % chance to gain Drive during strength training
-    efficiency_growth = Column(Integer, default=50)  # % chance to gain Efficiency during speed training
-    resilience_growth = Column(Integer, default=40)  # % chance to gain Resilience during endurance training
-    insight_growth = Column(Integer, default=30)     # % chance to gain Insight during wisdom training
-    luck_growth = Column(Integer, default=20)        # % chance to gain Luck during any training (low base chance)
+    hp_growth = Column(SmallInteger, default=80)       # % chance to gain HP during training
+    drive_growth = Column(SmallInteger, default=60)    # % chance to gain Drive during strength training
+    efficiency_growth = Column(SmallInteger, default=50)  # % chance to gain Efficiency during speed training
+    resilience_growth = Column(SmallInteger, default=40)  # % chance to gain Resilience during endurance training
+    insight_growth = Column(SmallInteger, default=30)     # % chance to gain Insight during wisdom training
+    luck_growth = Column(SmallInteger, default=20)        # % chance to gain Luck during any training (low base chance)
     
     # Recruitment Info
     hire_cost = Column(Integer, default=500)  # Cost to recruit
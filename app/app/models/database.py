@@ -6,12 +6,28 @@ import os
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///guildedin.db")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+if "sqlite" in DATABASE_URL:
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False}
+    )
+else:
+    # Server databases (PostgreSQL): size the pool for login bursts and reuse
+    # the most recently returned connection first (LIFO) so idle overflow
+    # connections age out instead of being cycled round-robin
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=10,
+        pool_recycle=1800,  # Recycle connections every 30 minutes
+        pool_pre_ping=True,
+        pool_use_lifo=True
+    )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Keep loaded attributes after commit: handlers commit and then render the same
+# objects, which would otherwise re-SELECT every row they touch
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
 def get_db():
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, Boolean, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -15,7 +15,7 @@ class GameSession(Base):
     
     # Game progression (Week-based calendar system)
     current_week = Column(Integer, default=1)      # Week 1, 2, 3, ... 
-    current_quarter = Column(Integer, default=1)   # Quarter 1, 2, 3, 4
+    current_quarter = Column(SmallInteger, default=1)   # Quarter 1, 2, 3, 4
     current_year = Column(Integer, default=1)      # Year 1, 2, 3, ...
     
     # Game state
@@ -27,8 +27,8 @@ class GameSession(Base):
     last_played_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Game configuration
-    weekly_action_limit = Column(Integer, default=5)  # Upgradeable
-    actions_remaining = Column(Integer, default=5)  # Current available actions
+    weekly_action_limit = Column(SmallInteger, default=5)  # Upgradeable
+    actions_remaining = Column(SmallInteger, default=5)  # Current available actions
     starting_gold = Column(Integer, default=5000)
     
     # Relationships
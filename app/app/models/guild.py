@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, ForeignKey, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -14,18 +14,18 @@ class Guild(Base):
     
     # Core Resources
     gold = Column(Integer, default=5000)  # Primary currency
-    gold_interest_rate = Column(Integer, default=5)  # 5% weekly interest (upgradeable)
+    gold_interest_rate = Column(SmallInteger, default=5)  # 5% weekly interest (upgradeable)
     
     # Guild Build System (replaces adventurer EXP)
     guild_exp = Column(Integer, default=0)  # EXP earned from all activities (training, dungeons, etc.)
     guild_exp_spent = Column(Integer, default=0)  # EXP spent on guild builds
     
     # Guild Build Bonuses (purchased with guild_exp)
-    training_efficiency_bonus = Column(Integer, default=0)  # % bonus to training gains
-    dungeon_reward_bonus = Column(Integer, default=0)      # % bonus to dungeon rewards
-    recruitment_cost_reduction = Column(Integer, default=0) # % reduction in hiring costs
-    facility_maintenance_reduction = Column(Integer, default=0)  # % reduction in facility costs
-    action_count_bonus = Column(Integer, default=0)        # Extra weekly actions
+    training_efficiency_bonus = Column(SmallInteger, default=0)  # % bonus to training gains
+    dungeon_reward_bonus = Column(SmallInteger, default=0)      # % bonus to dungeon rewards
+    recruitment_cost_reduction = Column(SmallInteger, default=0) # % reduction in hiring costs
+    facility_maintenance_reduction = Column(SmallInteger, default=0)  # % reduction in facility costs
+    action_count_bonus = Column(SmallInteger, default=0)        # Extra weekly actions
     
     # Share Price & Market Performance
     share_price = Column(Float, default=1.0)  # Starting share price: 1G (lowest rank)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, CheckConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
+from markupsafe import Markup, escape
 from .database import Base
 
 class CorporateClass(PyEnum):
@@ -13,13 +14,20 @@ class CorporateClass(PyEnum):
 class Player(Base):
     """Basic player authentication and profile"""
     __tablename__ = "players"
+    # Plain string column validated in the database, no enum coercion on every row load
+    __table_args__ = (
+        CheckConstraint(
+            "corporate_class IN (" + ", ".join(f"'{c.value}'" for c in CorporateClass) + ")",
+            name="ck_players_corporate_class",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     display_name = Column(String, nullable=False)
-    corporate_class = Column(Enum(CorporateClass), nullable=False)
+    corporate_class = Column(String(32), nullable=False)  # CorporateClass value
     
     # Account status
     is_active = Column(Boolean, default=True)
@@ -30,4 +38,9 @@ class Player(Base):
     
     # Relationships
     game_session = relationship("GameSession", back_populates="player", uselist=False)
-    guild = relationship("Guild", back_populates="owner", uselist=False)
\ No newline at end of file
+    guild = relationship("Guild", back_populates="owner", uselist=False)
+    
+    @property
+    def display_name_safe(self):
+        """Display name escaped as Markup; Jinja's autoescape passes it through unchanged"""
+        return Markup(escape(self.display_name))
@@ -36,7 +36,7 @@ def create_dev_user():
             username="dev",
             display_name="Dev Player",
             hashed_password=hashed_password,
-            corporate_class="HR_MANAGER",
+            corporate_class="hr_manager",
             is_active=True
         )
         db.add(dev_player)
@@ -1,23 +1,36 @@
-from fastapi import FastAPI, Request, Form, Depends, HTTPException, status
+from fastapi import FastAPI, Request, Form, Depends, HTTPException, status, Cookie
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, RedirectResponse, ORJSONResponse, Response, FileResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from datetime import timedelta
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from typing import Annotated, Optional
+from pydantic import BaseModel, ConfigDict, StringConstraints
+from sqlalchemy.orm import Session, selectinload
+import asyncio
+import gzip
+import hashlib
 import logging
+import random
 import traceback
 
+from app.models import load_all
 from app.models.database import get_db
 from app.models.user import Player
 from app.auth import (
     get_current_player_from_cookie, 
     authenticate_player, 
     create_player, 
-    create_access_token
+    create_access_token,
+    invalidate_session_token
 )
 
+# Register every model before the first query configures the mappers
+load_all()
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,49 +38,117 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="GuildedIn API",
     description="LinkedIn parody RPG game API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Set up templates and static files
 templates = Jinja2Templates(directory="templates")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
+def _etag(body: bytes) -> str:
+    # Weak, since GZipMiddleware sends the same tag on the gzipped bytes
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison against an If-None-Match list, ignoring W/ prefixes"""
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+def _conditional_html(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    """Serve an HTML body with its ETag, or 304 when the client already has it"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(body, headers=headers)
+
+@lru_cache(maxsize=1)
+def _landing_page():
+    """The landing page has no per-request data, so it is rendered once"""
+    body = templates.get_template("landing.html").render().encode()
+    return body, _etag(body)
+
+def _dashboard_response(request: Request, current_player: Player) -> Response:
+    """Render the activity feed; revalidated with an ETag since it is per player"""
+    body = templates.get_template("guild_dashboard.html").render(
+        request=request,
+        player=current_player,
+        game_session=current_player.game_session,
+        guild=current_player.guild,
+    ).encode()
+    return _conditional_html(request, body, _etag(body), "private, no-cache")
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],  # SvelteKit default dev server
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    # Content-Type plus the request headers HTMX sends
+    allow_headers=[
+        "Content-Type",
+        "HX-Boosted",
+        "HX-Current-URL",
+        "HX-History-Restore-Request",
+        "HX-Prompt",
+        "HX-Request",
+        "HX-Target",
+        "HX-Trigger",
+        "HX-Trigger-Name",
+    ],
+    max_age=86400,  # Let browsers cache preflight results for a day (Chromium caps at 2h)
 )
 
+# Endpoints that serve _precompressed fragments and negotiate the encoding themselves
+_PRECOMPRESSED_ENDPOINTS = set()
+
+def _serves_precompressed(endpoint):
+    """Keep GZipMiddleware away from a route that picks its own Content-Encoding"""
+    _PRECOMPRESSED_ENDPOINTS.add(endpoint)
+    return endpoint
+
+@lru_cache(maxsize=1)
+def _precompressed_paths() -> frozenset[str]:
+    """Paths of the marked routes, collected on the first request once every route exists"""
+    return frozenset(
+        route.path for route in app.routes
+        if getattr(route, "endpoint", None) in _PRECOMPRESSED_ENDPOINTS
+    )
+
+class _GZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes the precompressed fragment routes straight through"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in _precompressed_paths():
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress HTML pages and HTMX fragments; the SSE stream opts out explicitly
+app.add_middleware(_GZipMiddleware, minimum_size=256, compresslevel=5)
+
 @app.get("/", response_class=HTMLResponse)
 async def root(
     request: Request, 
-    current_player: Player = Depends(get_current_player_from_cookie),
-    db: Session = Depends(get_db)
+    current_player: Player = Depends(get_current_player_from_cookie)
 ):
     if current_player and current_player.game_session and current_player.guild:
         # Player is logged in with complete data, redirect to appropriate page
         if current_player.game_session.should_show_activity_feed:
             # Show activity feed for tutorial (week 1) and quarterly briefings (week 14)
-            return templates.TemplateResponse("guild_dashboard.html", {
-                "request": request, 
-                "player": current_player,
-                "game_session": current_player.game_session,
-                "guild": current_player.guild
-            })
+            return _dashboard_response(request, current_player)
         else:
             # Redirect to weekly planner for normal gameplay weeks
             return RedirectResponse(url="/weekly-planner", status_code=302)
     else:
         # Not logged in or incomplete data, show landing page
-        return templates.TemplateResponse("landing.html", {"request": request})
+        body, etag = _landing_page()
+        return _conditional_html(request, body, etag, "no-cache")
 
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(
     request: Request,
-    current_player: Player = Depends(get_current_player_from_cookie),
-    db: Session = Depends(get_db)
+    current_player: Player = Depends(get_current_player_from_cookie)
 ):
     if not current_player or not current_player.game_session or not current_player.guild:
         # Player doesn't exist or has incomplete data, redirect to landing
@@ -79,15 +160,12 @@ async def dashboard(
         return RedirectResponse(url="/weekly-planner", status_code=302)
     
     # Show activity feed for tutorial (week 1) and quarterly briefings (week 14)
-    return templates.TemplateResponse("guild_dashboard.html", {
-        "request": request, 
-        "player": current_player,
-        "game_session": current_player.game_session,
-        "guild": current_player.guild
-    })
+    return _dashboard_response(request, current_player)
 
+# Handlers that query through the synchronous Session are plain functions, so
+# FastAPI runs them in its threadpool instead of blocking the event loop
 @app.get("/weekly-planner", response_class=HTMLResponse)
-async def weekly_planner(
+def weekly_planner(
     request: Request,
     week_advanced: bool = False,
     current_player: Player = Depends(get_current_player_from_cookie),
@@ -109,7 +187,7 @@ async def weekly_planner(
     })
 
 @app.get("/recruit", response_class=HTMLResponse)
-async def recruit(
+def recruit(
     request: Request,
     current_player: Player = Depends(get_current_player_from_cookie),
     db: Session = Depends(get_db)
@@ -137,7 +215,7 @@ async def recruit(
     })
 
 @app.get("/adventurer/{adventurer_id}", response_class=HTMLResponse)
-async def adventurer_profile(
+def adventurer_profile(
     adventurer_id: int,
     request: Request,
     current_player: Player = Depends(get_current_player_from_cookie),
@@ -150,8 +228,11 @@ async def adventurer_profile(
     # Import Adventurer model
     from app.models.adventurer import Adventurer
     
-    # Fetch real adventurer from database
-    adventurer = db.query(Adventurer).filter(
+    # Fetch real adventurer from database, with the skill and trait descriptions the profile shows
+    adventurer = db.query(Adventurer).options(
+        selectinload(Adventurer.skills).undefer_group("details"),
+        selectinload(Adventurer.traits).undefer_group("details")
+    ).filter(
         Adventurer.id == adventurer_id,
         Adventurer.game_session_id == current_player.game_session.id
     ).first()
@@ -168,7 +249,7 @@ async def adventurer_profile(
     })
 
 @app.get("/train/{adventurer_id}", response_class=HTMLResponse)
-async def training_interface(
+def training_interface(
     adventurer_id: int,
     request: Request,
     current_player: Player = Depends(get_current_player_from_cookie),
@@ -199,7 +280,7 @@ async def training_interface(
     })
 
 @app.post("/api/train/{adventurer_id}")
-async def train_adventurer(
+def train_adventurer(
     adventurer_id: int,
     training_type: str = Form(...),
     current_player: Player = Depends(get_current_player_from_cookie),
@@ -378,7 +459,7 @@ async def train_adventurer(
         return HTMLResponse("❌ Training failed", status_code=500)
 
 @app.post("/api/advance-week")
-async def advance_week(
+def advance_week(
     current_player: Player = Depends(get_current_player_from_cookie),
     db: Session = Depends(get_db)
 ):
@@ -418,11 +499,47 @@ async def advance_week(
         logger.error(f"Week advancement error: {str(e)}")
         return HTMLResponse("❌ Failed to advance week", status_code=500)
 
+# Constant body encoded once; the Response is still built per request
+_HEALTH_BODY = b'{"status":"healthy"}'
+
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
+    return Response(_HEALTH_BODY, media_type="application/json")
 
 # Authentication Routes
+
+# Constant error fragments for the auth forms, encoded once at import time.
+# Responses are still built per request because middleware mutates response
+# headers in place, so a shared Response instance cannot be reused safely.
+_LOGIN_INVALID_BODY = """<div class="error-message" style="display: block;">
+    ❌ Invalid email or password. Please try again.
+</div>""".encode()
+
+_LOGIN_FAILED_BODY = """<div class="error-message" style="display: block;">
+    ❌ Login failed. Please try again later.
+</div>""".encode()
+
+_REGISTER_MISMATCH_BODY = """<div class="error-message" style="display: block;">
+    ❌ Passwords do not match. Please try again.
+</div>""".encode()
+
+_REGISTER_MISSING_BODY = """<div class="error-message" style="display: block;">
+    ❌ All fields are required. Please fill out the complete form.
+</div>""".encode()
+
+_REGISTER_FAILED_BODY = """<div class="error-message" style="display: block;">
+    ❌ Registration failed. Please try again later.
+</div>""".encode()
+
+# Session cookie attributes never change, so the Set-Cookie header is built
+# directly instead of going through SimpleCookie. JWTs are base64url and need
+# no cookie escaping. Add "; Secure" in production with HTTPS.
+_SESSION_COOKIE_ATTRS = "; HttpOnly; Max-Age=2592000; Path=/; SameSite=lax"  # 30 days
+
+def _session_cookie(access_token: str) -> str:
+    """Build the Set-Cookie header value for a session token"""
+    return f"session_token={access_token}{_SESSION_COOKIE_ATTRS}"
+
 @app.post("/api/auth/login")
 async def login(
     email: str = Form(...),
@@ -434,99 +551,72 @@ async def login(
     try:
         logger.info(f"Login attempt for email: {email}")
         
-        # Authenticate user
-        player = authenticate_player(db, email, password)
+        # Authenticate user (bcrypt verify runs in a worker thread)
+        player = await asyncio.to_thread(authenticate_player, db, email, password)
         if not player:
             logger.warning(f"Failed login attempt for email: {email}")
-            return HTMLResponse(
-                """<div class="error-message" style="display: block;">
-                    ❌ Invalid email or password. Please try again.
-                </div>""",
-                status_code=400
-            )
+            return HTMLResponse(_LOGIN_INVALID_BODY, status_code=400)
         
         logger.info(f"Successful login for player: {player.id}")
         
         # Create access token
         access_token = create_access_token(data={"sub": str(player.id)})
         
-        # Return success with redirect
-        response = HTMLResponse(
-            """<div style="color: #10b981; text-align: center; padding: 20px;">
-                ✅ Login successful! Redirecting to your guild...
-                <script>
-                    setTimeout(() => {
-                        window.location.href = "/dashboard";
-                    }, 1000);
-                </script>
-            </div>"""
-        )
-        
-        # Set the session cookie
-        response.set_cookie(
-            key="session_token",
-            value=access_token,
-            max_age=30 * 24 * 60 * 60,  # 30 days
-            httponly=True,
-            secure=False,  # Set to True in production with HTTPS
-            samesite="lax"
-        )
-        
-        return response
+        # Return success with an HTMX client-side redirect and the session cookie
+        return Response(status_code=204, headers={
+            "HX-Redirect": "/dashboard",
+            "Set-Cookie": _session_cookie(access_token),
+        })
         
     except Exception as e:
         logger.error(f"Unexpected error during login: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
-        return HTMLResponse(
-            """<div class="error-message" style="display: block;">
-                ❌ Login failed. Please try again later.
-            </div>""",
-            status_code=500
-        )
+        return HTMLResponse(_LOGIN_FAILED_BODY, status_code=500)
+
+# Text inputs are trimmed; passwords are taken verbatim
+FormText = Annotated[str, StringConstraints(strip_whitespace=True)]
+
+class RegisterForm(BaseModel):
+    """Registration form, validated in one pass; oversized fields are rejected before hashing"""
+    model_config = ConfigDict(extra="forbid", str_max_length=256)
+    
+    email: FormText
+    username: FormText
+    display_name: FormText
+    guild_name: FormText
+    corporate_class: FormText
+    password: str
+    confirm_password: str
 
 @app.post("/api/auth/register")
 async def register(
-    email: str = Form(...),
-    username: str = Form(...),
-    display_name: str = Form(...),
-    guild_name: str = Form(...),
-    corporate_class: str = Form(...),
-    password: str = Form(...),
-    confirm_password: str = Form(...),
+    form: Annotated[RegisterForm, Form()],
     db: Session = Depends(get_db)
 ):
     """Handle user registration"""
     
     # Validate password confirmation
-    if password != confirm_password:
-        return HTMLResponse(
-            """<div class="error-message" style="display: block;">
-                ❌ Passwords do not match. Please try again.
-            </div>""",
-            status_code=400
-        )
+    if form.password != form.confirm_password:
+        return HTMLResponse(_REGISTER_MISMATCH_BODY, status_code=400)
     
-    # Validate required fields
-    if not all([email, username, display_name, guild_name, corporate_class, password]):
-        return HTMLResponse(
-            """<div class="error-message" style="display: block;">
-                ❌ All fields are required. Please fill out the complete form.
-            </div>""",
-            status_code=400
-        )
+    # Validate required fields (present but blank inputs get a friendly message)
+    if not all([form.email, form.username, form.display_name, form.guild_name, form.corporate_class, form.password]):
+        return HTMLResponse(_REGISTER_MISSING_BODY, status_code=400)
     
     try:
-        logger.info(f"Starting registration process for email: {email}, username: {username}")
+        logger.info(f"Starting registration process for email: {form.email}, username: {form.username}")
         
-        # Create new player (this also creates the game session and guild)
-        player = create_player(
+        # Create new player (this also creates the game session and guild);
+        # password hashing runs in a worker thread to keep the event loop free
+        player = await asyncio.to_thread(
+            create_player,
             db=db,
-            email=email,
-            username=username,
-            password=password,
-            display_name=display_name,
-            corporate_class=corporate_class,
-            guild_name=guild_name
+            email=form.email,
+            username=form.username,
+            password=form.password,
+            display_name=form.display_name,
+            corporate_class=form.corporate_class,
+            guild_name=form.guild_name
         )
         
         logger.info(f"Player created successfully: {player.id}")
@@ -534,32 +624,13 @@ async def register(
         # Create access token
         access_token = create_access_token(data={"sub": str(player.id)})
         
-        # Return success with redirect
-        response = HTMLResponse(
-            f"""<div style="color: #10b981; text-align: center; padding: 20px;">
-                ✅ Welcome to GuildedIn, {display_name}!<br>
-                🏰 {guild_name} has been established!<br>
-                Redirecting to your guild dashboard...
-                <script>
-                    setTimeout(() => {{
-                        window.location.href = "/dashboard";
-                    }}, 2000);
-                </script>
-            </div>"""
-        )
-        
-        # Set the session cookie
-        response.set_cookie(
-            key="session_token",
-            value=access_token,
-            max_age=30 * 24 * 60 * 60,  # 30 days
-            httponly=True,
-            secure=False,  # Set to True in production with HTTPS
-            samesite="lax"
-        )
-        
         logger.info(f"Registration completed successfully for player: {player.id}")
-        return response
+        
+        # Return success with an HTMX client-side redirect and the session cookie
+        return Response(status_code=204, headers={
+            "HX-Redirect": "/dashboard",
+            "Set-Cookie": _session_cookie(access_token),
+        })
         
     except HTTPException as e:
         logger.error(f"HTTP Exception during registration: {e.status_code} - {e.detail}")
@@ -572,23 +643,20 @@ async def register(
     except Exception as e:
         logger.error(f"Unexpected error during registration: {str(e)}")
         logger.error(f"Full traceback: {traceback.format_exc()}")
-        return HTMLResponse(
-            f"""<div class="error-message" style="display: block;">
-                ❌ Registration failed: {str(e)}. Please try again later.
-            </div>""",
-            status_code=500
-        )
+        return HTMLResponse(_REGISTER_FAILED_BODY, status_code=500)
 
 @app.post("/api/auth/logout")
-async def logout():
+async def logout(session_token: Optional[str] = Cookie(None)):
     """Handle user logout"""
+    if session_token:
+        invalidate_session_token(session_token)
     response = RedirectResponse(url="/", status_code=302)
     response.delete_cookie(key="session_token")
     return response
 
 # Time Management API Routes
 @app.post("/api/advance-week")
-async def advance_week(
+def advance_week(
     request: Request,
     current_player: Player = Depends(get_current_player_from_cookie),
     db: Session = Depends(get_db)
@@ -608,7 +676,7 @@ async def advance_week(
     return RedirectResponse(url="/weekly-planner", status_code=302)
 
 @app.post("/api/recruit/{adventurer_id}")
-async def recruit_adventurer(
+def recruit_adventurer(
     adventurer_id: int,
     current_player: Player = Depends(get_current_player_from_cookie),
     db: Session = Depends(get_db)
@@ -664,163 +732,88 @@ async def recruit_adventurer(
         return HTMLResponse(f"❌ Recruitment failed: {str(e)}", status_code=500)
 
 # HTMX API Routes
+
+def _precompressed(body: bytes) -> tuple[bytes, bytes]:
+    """Pair a constant HTML body with its gzip encoding, compressed once at import"""
+    return body, gzip.compress(body, compresslevel=9)
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether Accept-Encoding allows gzip, honouring q-values (gzip;q=0 refuses it)"""
+    qualities = {}
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+def _fragment_response(request: Request, fragment: tuple[bytes, bytes]) -> Response:
+    """Serve a precompressed fragment as-is when the client accepts gzip"""
+    body, gzip_body = fragment
+    # Both variants carry Vary so shared caches never mix them up; the routes are
+    # marked with _serves_precompressed so GZipMiddleware never sees them
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        return HTMLResponse(gzip_body, headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+    return HTMLResponse(body, headers={"Vary": "Accept-Encoding"})
+
+def _render_fragment(name: str, **context) -> tuple[bytes, bytes]:
+    """Render a constant fragment from templates/fragments, encoded and gzipped"""
+    return _precompressed(templates.get_template(f"fragments/{name}.html").render(**context).encode())
+
+# Mock CEO sidebar fragments for the HTMX action endpoints, rendered once at
+# import time; the handlers only pick the prebuilt bytes
+_RECRUIT_HTML = _render_fragment("ceo_sidebar", stats=[
+    ("💰 Gold", "3950", None),
+    ("✨ EXP Bank", "2,290", None),
+    ("📈 Share Price", "152.3G", None),
+    ("🏆 Guild Rank", "C", "rank-c"),
+])
+
+_TRAIN_HTML = _render_fragment("ceo_sidebar", stats=[
+    ("💰 Gold", "4500", None),
+    ("✨ EXP Bank", "2,190", None),
+    ("📈 Share Price", "149.7G", None),
+    ("🏆 Guild Rank", "C", "rank-c"),
+])
+
+_DISTRIBUTE_EXP_HTML = _render_fragment("ceo_sidebar", stats=[
+    ("💰 Gold", "4750", None),
+    ("✨ EXP Bank", "2,140", None),
+    ("⭐ Reputation", "92", None),
+])
+
+_RESERVE_EXP_HTML = _render_fragment("ceo_sidebar", stats=[
+    ("💰 Gold", "4750", None),
+    ("✨ EXP Bank", "1,840", None),
+    ("⭐ Reputation", "92", None),
+])
+
+# Upgrades swap in a different guild profile and facility list
+_UPGRADE_HTML = _render_fragment("upgrade")
+
 @app.post("/api/actions/recruit")
-async def recruit_action():
+@_serves_precompressed
+async def recruit_action(request: Request):
     # Mock response - simulate recruiting an adventurer
-    return HTMLResponse("""
-    <aside class="guild-sidebar" id="guild-resources">
-        <div class="ceo-profile">
-            <div class="ceo-avatar">👨‍💼</div>
-            <h2 class="ceo-name">Alex Rodriguez</h2>
-            <p class="ceo-title">CEO of TechCorp Guild</p>
-            <div class="ceo-background">
-                <span class="background-badge">⚔️ Warrior</span>
-            </div>
-        </div>
-        
-        <div class="resource-stats">
-            <div class="stat-item">
-                <span class="stat-label">💰 Gold</span>
-                <span class="stat-value">3950</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">✨ EXP Bank</span>
-                <span class="stat-value">2,290</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">💰 Gold</span>
-                <span class="stat-value">3950</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">✨ EXP Bank</span>
-                <span class="stat-value">2,290</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">📈 Share Price</span>
-                <span class="stat-value">152.3G</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">🏆 Guild Rank</span>
-                <span class="stat-value rank-c">C</span>
-            </div>
-        </div>
-
-        <div class="facilities-section">
-            <h3 class="section-title">Facilities</h3>
-            <div class="facility-item">
-                <span class="facility-name">Training Grounds</span>
-                <span class="facility-level">Lv.3</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Armory</span>
-                <span class="facility-level">Lv.2</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Infirmary</span>
-                <span class="facility-level">Lv.1</span>
-            </div>
-        </div>
-    </aside>
-    """)
+    return _fragment_response(request, _RECRUIT_HTML)
 
 @app.post("/api/actions/train")
-async def train_action():
+@_serves_precompressed
+async def train_action(request: Request):
     # Mock response - simulate training adventurers
-    return HTMLResponse("""
-    <aside class="guild-sidebar" id="guild-resources">
-        <div class="ceo-profile">
-            <div class="ceo-avatar">👨‍💼</div>
-            <h2 class="ceo-name">Alex Rodriguez</h2>
-            <p class="ceo-title">CEO of TechCorp Guild</p>
-            <div class="ceo-background">
-                <span class="background-badge">⚔️ Warrior</span>
-            </div>
-        </div>
-        
-        <div class="resource-stats">
-            <div class="stat-item">
-                <span class="stat-label">💰 Gold</span>
-                <span class="stat-value">4500</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">✨ EXP Bank</span>
-                <span class="stat-value">2,190</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">📈 Share Price</span>
-                <span class="stat-value">149.7G</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">🏆 Guild Rank</span>
-                <span class="stat-value rank-c">C</span>
-            </div>
-        </div>
-
-        <div class="facilities-section">
-            <h3 class="section-title">Facilities</h3>
-            <div class="facility-item">
-                <span class="facility-name">Training Grounds</span>
-                <span class="facility-level">Lv.3</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Armory</span>
-                <span class="facility-level">Lv.2</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Infirmary</span>
-                <span class="facility-level">Lv.1</span>
-            </div>
-        </div>
-    </aside>
-    """)
+    return _fragment_response(request, _TRAIN_HTML)
 
 @app.post("/api/actions/upgrade")
-async def upgrade_action():
+@_serves_precompressed
+async def upgrade_action(request: Request):
     # Mock response - simulate upgrading facilities
-    return HTMLResponse("""
-    <aside class="guild-sidebar" id="guild-resources">
-        <div class="guild-profile">
-            <div class="guild-avatar">🏰</div>
-            <h2 class="guild-name">TechCorp Guild</h2>
-            <p class="guild-level">Level 13</p>
-        </div>
-        
-        <div class="resource-stats">
-            <div class="stat-item">
-                <span class="stat-label">💰 Gold</span>
-                <span class="stat-value">2750</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">✨ EXP Bank</span>
-                <span class="stat-value">2,490</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">📈 Share Price</span>
-                <span class="stat-value">155.8G</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">🏆 Guild Rank</span>
-                <span class="stat-value rank-c">C</span>
-            </div>
-        </div>
-
-        <div class="facilities-section">
-            <h3 class="section-title">Facilities</h3>
-            <div class="facility-item">
-                <span class="facility-name">Executive Training Suite</span>
-                <span class="facility-level">Lv.4</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Innovation Lab</span>
-                <span class="facility-level">Lv.3</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Wellness Center</span>
-                <span class="stat-value">Lv.2</span>
-            </div>
-        </div>
-    </aside>
-    """)
+    return _fragment_response(request, _UPGRADE_HTML)
 
 @app.post("/api/like/{post_id}")
 async def like_post(post_id: int):
@@ -828,108 +821,23 @@ async def like_post(post_id: int):
     return HTMLResponse(f'<button class="action-btn" hx-post="/api/unlike/{post_id}" hx-target="this" hx-swap="outerHTML">👍 13</button>')
 
 @app.post("/api/distribute-exp")
-async def distribute_exp():
+@_serves_precompressed
+async def distribute_exp(request: Request):
     # Mock response - simulate distributing EXP to adventurers
-    return HTMLResponse("""
-    <aside class="guild-sidebar" id="guild-resources">
-        <div class="ceo-profile">
-            <div class="ceo-avatar">👨‍💼</div>
-            <h2 class="ceo-name">Alex Rodriguez</h2>
-            <p class="ceo-title">CEO of TechCorp Guild</p>
-            <div class="ceo-background">
-                <span class="background-badge">⚔️ Warrior</span>
-            </div>
-        </div>
-        
-        <div class="resource-stats">
-            <div class="stat-item">
-                <span class="stat-label">💰 Gold</span>
-                <span class="stat-value">4750</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">✨ EXP Bank</span>
-                <span class="stat-value">2,140</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">⭐ Reputation</span>
-                <span class="stat-value">92</span>
-            </div>
-        </div>
-
-        <div class="facilities-section">
-            <h3 class="section-title">Facilities</h3>
-            <div class="facility-item">
-                <span class="facility-name">Training Grounds</span>
-                <span class="facility-level">Lv.3</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Armory</span>
-                <span class="facility-level">Lv.2</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Infirmary</span>
-                <span class="facility-level">Lv.1</span>
-            </div>
-        </div>
-    </aside>
-    """)
+    return _fragment_response(request, _DISTRIBUTE_EXP_HTML)
 
 @app.post("/api/reserve-exp")
-async def reserve_exp():
+@_serves_precompressed
+async def reserve_exp(request: Request):
     # Mock response - simulate reserving EXP for interest
-    return HTMLResponse("""
-    <aside class="guild-sidebar" id="guild-resources">
-        <div class="ceo-profile">
-            <div class="ceo-avatar">👨‍💼</div>
-            <h2 class="ceo-name">Alex Rodriguez</h2>
-            <p class="ceo-title">CEO of TechCorp Guild</p>
-            <div class="ceo-background">
-                <span class="background-badge">⚔️ Warrior</span>
-            </div>
-        </div>
-        
-        <div class="resource-stats">
-            <div class="stat-item">
-                <span class="stat-label">💰 Gold</span>
-                <span class="stat-value">4750</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">✨ EXP Bank</span>
-                <span class="stat-value">1,840</span>
-            </div>
-            <div class="stat-item">
-                <span class="stat-label">⭐ Reputation</span>
-                <span class="stat-value">92</span>
-            </div>
-        </div>
-
-        <div class="facilities-section">
-            <h3 class="section-title">Facilities</h3>
-            <div class="facility-item">
-                <span class="facility-name">Training Grounds</span>
-                <span class="facility-level">Lv.3</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Armory</span>
-                <span class="facility-level">Lv.2</span>
-            </div>
-            <div class="facility-item">
-                <span class="facility-name">Infirmary</span>
-                <span class="facility-level">Lv.1</span>
-            </div>
-        </div>
-    </aside>
-    """)
+    return _fragment_response(request, _RESERVE_EXP_HTML)
 
 @app.post("/api/unlike/{post_id}")
 async def unlike_post(post_id: int):
     # Mock response - simulate unliking a post
     return HTMLResponse(f'<button class="action-btn" hx-post="/api/like/{post_id}" hx-target="this" hx-swap="outerHTML">👍 12</button>')
 
-@app.get("/api/exp-management")
-async def exp_management_view():
-    # Mock response - EXP banking interface
-    return HTMLResponse("""
+_EXP_MANAGEMENT_HTML = _precompressed("""
     <div class="feed-container">
         <div class="activity-post">
             <div class="post-inner">
@@ -971,12 +879,15 @@ async def exp_management_view():
             </div>
         </div>
     </div>
-    """)
+    """.encode())
 
-@app.get("/api/market")
-async def market_view():
-    # Mock response - simulate market view
-    return HTMLResponse("""
+@app.get("/api/exp-management")
+@_serves_precompressed
+async def exp_management_view(request: Request):
+    # Mock response - EXP banking interface
+    return _fragment_response(request, _EXP_MANAGEMENT_HTML)
+
+_MARKET_HTML = _precompressed("""
     <div class="feed-container">
         <div class="activity-post">
             <div class="post-inner">
@@ -1015,7 +926,13 @@ async def market_view():
             </div>
         </div>
     </div>
-    """)
+    """.encode())
+
+@app.get("/api/market")
+@_serves_precompressed
+async def market_view(request: Request):
+    # Mock response - simulate market view
+    return _fragment_response(request, _MARKET_HTML)
 
 # Dungeon System Routes
 @app.get("/dungeons/marketplace")
@@ -1041,272 +958,163 @@ async def get_marketplace_dungeons():
     </div>
     """)
 
-@app.get("/api/dungeons/details/{dungeon_id}")
-async def get_dungeon_details(dungeon_id: int):
-    # Mock response - dungeon details for sidebar
-    dungeons = {
-        1: {
-            "name": "🏛️ Ancient Tokyo Ruins",
-            "location": "Tokyo, Japan",
-            "rank": "C",
-            "rooms": 7,
-            "bonus": "2,000G",
-            "slots": "2/3",
-            "high_bid": "1,200G",
-            "closes": "3h 42m"
-        },
-        2: {
-            "name": "⛰️ Himalayan Crystal Caves", 
-            "location": "Nepal",
-            "rank": "B",
-            "rooms": 10,
-            "bonus": "4,000G",
-            "slots": "1/2", 
-            "high_bid": "2,800G",
-            "closes": "8h 15m"
-        },
-        3: {
-            "name": "🏖️ Bermuda Portal",
-            "location": "Atlantic Ocean", 
-            "rank": "A",
-            "rooms": 12,
-            "bonus": "8,000G",
-            "slots": "1/1",
-            "high_bid": "5,500G",
-            "closes": "12h 30m"
-        }
+# Mock dungeon listings for the details sidebar, with derived display fields
+# (rank CSS class, suggested next bid) computed once at import time
+_DUNGEONS = {
+    1: {
+        "name": "🏛️ Ancient Tokyo Ruins",
+        "location": "Tokyo, Japan",
+        "rank": "C",
+        "rooms": 7,
+        "bonus": "2,000G",
+        "slots": "2/3",
+        "high_bid": "1,200G",
+        "closes": "3h 42m"
+    },
+    2: {
+        "name": "⛰️ Himalayan Crystal Caves", 
+        "location": "Nepal",
+        "rank": "B",
+        "rooms": 10,
+        "bonus": "4,000G",
+        "slots": "1/2", 
+        "high_bid": "2,800G",
+        "closes": "8h 15m"
+    },
+    3: {
+        "name": "🏖️ Bermuda Portal",
+        "location": "Atlantic Ocean", 
+        "rank": "A",
+        "rooms": 12,
+        "bonus": "8,000G",
+        "slots": "1/1",
+        "high_bid": "5,500G",
+        "closes": "12h 30m"
     }
-    
-    dungeon = dungeons.get(dungeon_id, dungeons[1])
-    
-    return HTMLResponse(f"""
-    <h3 class="section-title">📍 {dungeon['name']}</h3>
+}
+
+for _dungeon in _DUNGEONS.values():
+    _dungeon["rank_lower"] = _dungeon["rank"].lower()
+    _dungeon["next_bid"] = int(_dungeon["high_bid"].replace("G", "").replace(",", "")) + 100
+
+_DETAILS_TPL = """
+    <h3 class="section-title">📍 {name}</h3>
     <div class="dungeon-details">
         <div class="detail-row">
             <span>📍 Location:</span>
-            <span class="detail-value">{dungeon['location']}</span>
+            <span class="detail-value">{location}</span>
         </div>
         <div class="detail-row">
             <span>🏆 Rank:</span>
-            <span class="detail-value rank-{dungeon['rank'].lower()}">{dungeon['rank']}</span>
+            <span class="detail-value rank-{rank_lower}">{rank}</span>
         </div>
         <div class="detail-row">
             <span>🏠 Total Rooms:</span>
-            <span class="detail-value">{dungeon['rooms']}</span>
+            <span class="detail-value">{rooms}</span>
         </div>
         <div class="detail-row">
             <span>💰 Completion Bonus:</span>
-            <span class="detail-value">{dungeon['bonus']}</span>
+            <span class="detail-value">{bonus}</span>
         </div>
         <div class="detail-row">
             <span>🎯 Available Slots:</span>
-            <span class="detail-value">{dungeon['slots']}</span>
+            <span class="detail-value">{slots}</span>
         </div>
         <div class="detail-row">
             <span>💎 Current High Bid:</span>
-            <span class="detail-value">{dungeon['high_bid']}</span>
+            <span class="detail-value">{high_bid}</span>
         </div>
     </div>
     
     <div class="bidding-section">
-        <div class="bidding-status">⏰ Bidding closes in: {dungeon['closes']}</div>
+        <div class="bidding-status">⏰ Bidding closes in: {closes}</div>
         <input type="number" class="bid-input" placeholder="Enter your bid" id="bid-{dungeon_id}" 
-               value="{int(dungeon['high_bid'].replace('G', '').replace(',', '')) + 100}">
+               value="{next_bid}">
         <button class="bid-button" hx-post="/api/dungeons/bid" hx-include="#bid-{dungeon_id}" 
                 hx-vals='{{"dungeon_id": {dungeon_id}}}' hx-target="#selected-dungeon" hx-swap="innerHTML">
             💰 Submit Bid
         </button>
     </div>
-    """)
+    """
+
+@app.get("/api/dungeons/details/{dungeon_id}")
+async def get_dungeon_details(dungeon_id: int):
+    # Mock response - dungeon details for sidebar
+    dungeon = _DUNGEONS.get(dungeon_id, _DUNGEONS[1])
+    return HTMLResponse(_DETAILS_TPL.format(dungeon_id=dungeon_id, **dungeon))
+
+# Static dungeon mock fragments live in static/mocks so a reverse proxy can
+# serve them directly without hitting the app; FileResponse serves them otherwise
+_MOCKS_DIR = Path("static/mocks")
 
 @app.get("/api/dungeons/time-status")
 async def get_time_status():
     # Mock response - time tracking
-    return HTMLResponse("""
-    <div class="time-remaining">⏰ 4h 12m remaining</div>
-    <div class="daily-limit">Daily: 6h 48m used / 8h limit</div>
-    """)
+    return FileResponse(_MOCKS_DIR / "time_status.html", media_type="text/html")
 
 @app.get("/api/dungeons/room-status")
 async def get_room_status():
     # Mock response - updated room states
-    return HTMLResponse("""
-    <!-- Entrance -->
-    <div class="room-cell" hx-post="/api/dungeons/advance" hx-vals='{"room": 1}' hx-target="#dungeon-main">
-        <div class="room-number">START</div>
-        <div class="room-icon">🚪</div>
-        <div class="room-status">Entrance</div>
-    </div>
-
-    <!-- Room 1 - Current -->
-    <div class="room-cell current" hx-post="/api/dungeons/combat" hx-target="#combat-modal" hx-swap="innerHTML">
-        <div class="room-number">1</div>
-        <div class="room-icon">⚔️</div>
-        <div class="room-status">Combat Ready</div>
-    </div>
-
-    <!-- Room 2 - Mining Progress Updated -->
-    <div class="room-cell cleared mining">
-        <div class="room-number">2</div>
-        <div class="room-icon">⛏️</div>
-        <div class="room-status">Mining 73%</div>
-        <div class="mining-progress">
-            <div class="mining-fill" style="width: 73%;"></div>
-        </div>
-    </div>
-
-    <!-- Remaining rooms (3-9) -->
-    <div class="room-cell">
-        <div class="room-number">3</div>
-        <div class="room-icon">❓</div>
-        <div class="room-status">Unexplored</div>
-    </div>
-
-    <div class="room-cell">
-        <div class="room-number">4</div>
-        <div class="room-icon">❓</div>
-        <div class="room-status">Unexplored</div>
-    </div>
-
-    <div class="room-cell">
-        <div class="room-number">5</div>
-        <div class="room-icon">❓</div>
-        <div class="room-status">Unexplored</div>
-    </div>
-
-    <div class="room-cell">
-        <div class="room-number">6</div>
-        <div class="room-icon">❓</div>
-        <div class="room-status">Unexplored</div>
-    </div>
-
-    <div class="room-cell">
-        <div class="room-number">7</div>
-        <div class="room-icon">❓</div>
-        <div class="room-status">Unexplored</div>
-    </div>
-
-    <div class="room-cell">
-        <div class="room-number">8</div>
-        <div class="room-icon">❓</div>
-        <div class="room-status">Unexplored</div>
-    </div>
-
-    <div class="room-cell">
-        <div class="room-number">9</div>
-        <div class="room-icon">❓</div>
-        <div class="room-status">Unexplored</div>
-    </div>
-
-    <!-- Boss Room -->
-    <div class="room-cell boss">
-        <div class="room-number">10</div>
-        <div class="room-icon">👹</div>
-        <div class="room-status">Frost Titan</div>
-    </div>
-    """)
+    return FileResponse(_MOCKS_DIR / "room_status.html", media_type="text/html")
 
 @app.post("/api/dungeons/combat")
 async def start_combat():
     # Mock response - combat modal
-    return HTMLResponse("""
-    <div class="combat-modal">
-        <div class="combat-content">
-            <h2 class="combat-title">⚔️ Combat in Progress</h2>
-            <div style="text-align: center; margin: 20px 0;">
-                <div style="font-size: 14px; margin-bottom: 16px;">
-                    Your party engages 3 Crystal Golems!
-                </div>
-                <div style="background: #1f2937; border: 2px solid #374151; padding: 12px; margin: 12px 0;">
-                    <div style="font-family: 'Press Start 2P', monospace; font-size: 8px; color: #10b981; margin-bottom: 8px;">
-                        COMBAT LOG
-                    </div>
-                    <div style="font-size: 12px; line-height: 1.6; text-align: left;">
-                        • Sarah casts Healing Light (+45 HP to party)<br>
-                        • Mike attacks with Sword Strike (78 damage)<br>
-                        • Lisa uses Shield Bash (65 damage, stun)<br>
-                        • Golem #1 destroyed!
-                    </div>
-                </div>
-                <div style="margin: 16px 0;">
-                    <strong style="color: #10b981;">Victory!</strong><br>
-                    💰 +400 Gold • ✨ +180 EXP
-                </div>
-            </div>
-            <div style="display: flex; gap: 12px; justify-content: center;">
-                <button class="action-button" hx-post="/api/dungeons/advance" hx-vals='{"room": 2}' hx-target="#dungeon-main" hx-swap="innerHTML" onclick="document.getElementById('combat-modal').style.display='none'">
-                    ➡️ Advance to Room 2
-                </button>
-                <button class="action-button" hx-post="/api/dungeons/start-mining" hx-vals='{"room": 1}' hx-target="#room-grid" hx-swap="innerHTML" onclick="document.getElementById('combat-modal').style.display='none'">
-                    ⛏️ Start Mining Here
-                </button>
-            </div>
-        </div>
-    </div>
-    """)
+    return FileResponse(_MOCKS_DIR / "combat.html", media_type="text/html")
 
 @app.get("/api/dungeons/party-status")
 async def get_party_status():
     # Mock response - party health updates
-    return HTMLResponse("""
-    <h3 style="font-family: 'Press Start 2P', monospace; font-size: 9px; color: #10b981; margin: 0 0 8px 0;">Party Status</h3>
-    
-    <div class="party-member">
-        <span>Sarah (Healer)</span>
-        <div class="health-bar">
-            <div class="health-fill" style="width: 88%;"></div>
-        </div>
-    </div>
-    
-    <div class="party-member">
-        <span>Mike (Fighter)</span>
-        <div class="health-bar">
-            <div class="health-fill" style="width: 76%;"></div>
-        </div>
-    </div>
-    
-    <div class="party-member">
-        <span>Lisa (Paladin)</span>
-        <div class="health-bar">
-            <div class="health-fill" style="width: 82%;"></div>
-        </div>
-    </div>
-    """)
+    return FileResponse(_MOCKS_DIR / "party_status.html", media_type="text/html")
 
 @app.post("/api/dungeons/bid")
 async def submit_bid():
     # Mock response - bid submission (only costs money, not actions)
-    return HTMLResponse("""
-    <h3 class="section-title">💰 Bid Submitted</h3>
-    <div style="color: #10b981; font-size: 12px; margin: 8px 0;">
-        ✓ Bid of 1,500G submitted successfully!<br>
-        Status: Pending review<br>
-        Results in: 3h 41m
-    </div>
-    <button class="bid-button" disabled>
-        Bid Submitted
-    </button>
-    """)
+    return FileResponse(_MOCKS_DIR / "bid.html", media_type="text/html")
 
 # Server-Sent Events for real-time updates
 from fastapi.responses import StreamingResponse
-import json
-import asyncio
+import orjson
+
+# Mock SSE payloads never change, so the wire-format frames are encoded once
+_MINING_FRAME = b"event: mining-update\ndata: " + orjson.dumps({"room": 2, "progress": 75}) + b"\n\n"
+_TIME_FRAME = b"event: time-update\ndata: " + orjson.dumps({"remaining_minutes": 250}) + b"\n\n"
 
 @app.get("/api/dungeons/events")
 async def dungeon_events():
     async def event_generator():
+        # Jitter the tick intervals so clients that connected together don't
+        # all wake on the same boundary
         while True:
             # Mining progress update
-            yield f"event: mining-update\ndata: {json.dumps({'room': 2, 'progress': 75})}\n\n"
-            await asyncio.sleep(30)
+            yield _MINING_FRAME
+            await asyncio.sleep(30 + random.uniform(-2, 2))
             
             # Time update
-            yield f"event: time-update\ndata: {json.dumps({'remaining_minutes': 250})}\n\n"
-            await asyncio.sleep(60)
+            yield _TIME_FRAME
+            await asyncio.sleep(60 + random.uniform(-2, 2))
     
-    return StreamingResponse(event_generator(), media_type="text/plain")
+    # Ask clients and reverse proxies not to cache, buffer or compress the
+    # stream; gzip would hold events back and break SSE framing
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "Content-Encoding": "identity"}
+    )
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    
+    # uvloop and httptools come with uvicorn[standard]; multiple workers need
+    # the import string so each worker imports the app itself
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 2)),
+        timeout_keep_alive=30,
+        limit_concurrency=1000
+    )
@@ -4,12 +4,18 @@ Generate initial pool of recruitable adventurers with skills and traits
 """
 
 import random
+import sys
+from collections import Counter
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+from app.models import load_all
 from app.models.database import SessionLocal
 from app.models.adventurer import Adventurer, Skill, Trait, AdventurerClass, AdventurerSeniority, AdventurerRole
+from app.models.adventurer import adventurer_skills, adventurer_traits
 from app.models.game_session import GameSession
 
 # Fantasy name pools for generating adventurers
-FIRST_NAMES = [
+FIRST_NAMES = (
     # Male names
     "Aiden", "Bjorn", "Cedric", "Darius", "Erik", "Finn", "Gareth", "Hank", "Ivan", "Jasper",
     "Kael", "Liam", "Magnus", "Nolan", "Owen", "Pierce", "Quinn", "Raven", "Soren", "Thane",
@@ -19,89 +25,106 @@ FIRST_NAMES = [
     "Aria", "Brenna", "Cora", "Diana", "Elara", "Freya", "Gwen", "Hazel", "Iris", "Jora",
     "Kira", "Luna", "Mira", "Nora", "Olivia", "Piper", "Quinn", "Ruby", "Sage", "Tara",
     "Una", "Vera", "Wren", "Xara", "Yara", "Zoe"
-]
+)
 
-LAST_NAMES = [
+LAST_NAMES = (
     "Ironforge", "Stormwind", "Brightblade", "Shadowmere", "Goldleaf", "Flameheart", "Frostborn",
     "Earthshaker", "Windwalker", "Starfall", "Moonbane", "Sunspear", "Darkbane", "Lightbringer",
     "Swiftstrike", "Stronghammer", "Shieldheart", "Bloodfang", "Whitehawk", "Blackthorn",
     "Silverleaf", "Copperbeard", "Ironwill", "Steelclaw", "Firemane", "Icevein", "Stonefist",
     "Lightfoot", "Deepdelver", "Highmountain", "Lowbrook", "Fairwind", "Grimheart", "Brightshot"
-]
+)
 
-def generate_adventurer_name():
-    """Generate a fantasy name for an adventurer"""
-    first = random.choice(FIRST_NAMES)
-    last = random.choice(LAST_NAMES)
-    return f"{first} {last}"
+ADVENTURER_CLASSES = ("warrior", "archer", "mage", "paladin")
+SENIORITY_VALUES = tuple(s.value for s in AdventurerSeniority)
 
-def generate_base_stats(adventurer_class, seniority):
+# Hiring economics and skill/trait count ranges by seniority
+SENIORITY_HIRE_COSTS = {"junior": 300, "mid": 500, "senior": 800}
+SENIORITY_BASE_SALARIES = {"junior": 25, "mid": 45, "senior": 75}
+SKILL_COUNT_RANGES = {"junior": (2, 3), "mid": (3, 4), "senior": (4, 6)}
+TRAIT_COUNT_RANGES = {"junior": (1, 2), "mid": (2, 3), "senior": (3, 4)}
+
+# Base stat templates by class (new 5-stat system, 4 classes only), in STAT_NAMES order
+STAT_NAMES = ("max_hp", "drive", "efficiency", "resilience", "insight", "luck")
+STAT_MINIMUMS = (50, 5, 5, 5, 5, 5)
+BASE_STAT_TEMPLATES = {
+    "warrior": (110, 15, 8, 14, 6, 8),
+    "archer": (80, 10, 15, 8, 9, 12),
+    "mage": (70, 6, 9, 7, 16, 11),
+    "paladin": (105, 12, 7, 13, 11, 9),
+}
+
+# Seniority multipliers
+SENIORITY_MULTIPLIERS = {
+    "junior": 0.8,   # 80% of base stats
+    "mid": 1.0,      # 100% of base stats
+    "senior": 1.3    # 130% of base stats
+}
+
+def generate_base_stats(adventurer_class, seniority, rng):
     """Generate base stats using the new 5-stat system: Drive, Efficiency, Resilience, Insight, Luck"""
+    base_template = BASE_STAT_TEMPLATES.get(adventurer_class, BASE_STAT_TEMPLATES["warrior"])
+    multiplier = SENIORITY_MULTIPLIERS.get(seniority, 1.0)
     
-    # Base stat templates by class (new 5-stat system, 4 classes only)
-    base_stat_templates = {
-        "warrior": {"hp": 110, "drive": 15, "efficiency": 8, "resilience": 14, "insight": 6, "luck": 8},
-        "archer": {"hp": 80, "drive": 10, "efficiency": 15, "resilience": 8, "insight": 9, "luck": 12},
-        "mage": {"hp": 70, "drive": 6, "efficiency": 9, "resilience": 7, "insight": 16, "luck": 11},
-        "paladin": {"hp": 105, "drive": 12, "efficiency": 7, "resilience": 13, "insight": 11, "luck": 9},
+    # Apply random variation (±15%) and seniority multiplier, then enforce minimum values
+    stats = {
+        stat: max(int(base_value * multiplier * rng.uniform(0.85, 1.15)), minimum)
+        for stat, base_value, minimum in zip(STAT_NAMES, base_template, STAT_MINIMUMS)
     }
-    
-    # Seniority multipliers
-    seniority_multipliers = {
-        "junior": 0.8,   # 80% of base stats
-        "mid": 1.0,      # 100% of base stats
-        "senior": 1.3    # 130% of base stats
-    }
-    
-    base_template = base_stat_templates.get(adventurer_class, base_stat_templates["warrior"])
-    multiplier = seniority_multipliers.get(seniority, 1.0)
-    
-    # Apply random variation (±15%) and seniority multiplier
-    stats = {}
-    for stat, base_value in base_template.items():
-        variation = random.uniform(0.85, 1.15)  # ±15% variation
-        final_value = int(base_value * multiplier * variation)
-        
-        # Ensure minimum values
-        if stat == "hp":
-            stats["max_hp"] = max(final_value, 50)
-            stats["current_hp"] = stats["max_hp"]
-        else:
-            stats[stat] = max(final_value, 5)
+    stats["current_hp"] = stats["max_hp"]
     
     return stats
 
-def assign_skills_to_adventurer(db, adventurer, adventurer_class):
-    """Assign appropriate skills based on class and randomness"""
-    # Get all available skills
-    all_skills = db.query(Skill).all()
-    
-    # Filter skills for this class
-    class_skills = []
+def load_skill_pools(db):
+    """Load all skills once and split them into class-specific and universal pools"""
+    class_skills_by_class = {}
     universal_skills = []
     
-    for skill in all_skills:
-        if skill.restricted_to_classes is None:
+    for skill in db.query(Skill).options(selectinload(Skill.class_restrictions)):
+        restricted_classes = skill.restricted_classes
+        if not restricted_classes:
             universal_skills.append(skill)
-        elif adventurer_class in skill.restricted_to_classes.split(','):
-            class_skills.append(skill)
+        else:
+            for class_name in restricted_classes:
+                class_skills_by_class.setdefault(class_name, []).append(skill)
+    
+    first_aid = next((s for s in universal_skills if s.name == "First Aid"), None)
+    return class_skills_by_class, universal_skills, first_aid
+
+# Trait rarity distribution: 55% common, 25% uncommon, 15% rare, 5% legendary
+TRAIT_RARITIES = ("common", "uncommon", "rare", "legendary")
+TRAIT_RARITY_WEIGHTS = (55, 25, 15, 5)
+
+def load_trait_pools(db):
+    """Load all traits once, bucket them by rarity and resolve the rarity fallback"""
+    traits_by_rarity = {rarity: [] for rarity in TRAIT_RARITIES}
+    for trait in db.query(Trait).all():
+        traits_by_rarity.setdefault(trait.rarity, []).append(trait)
+    
+    # A rolled rarity with no traits falls back to the next lower rarity that has some
+    rarity_fallback = {}
+    for i, rarity in enumerate(TRAIT_RARITIES):
+        rarity_fallback[rarity] = next(
+            (lower for lower in reversed(TRAIT_RARITIES[:i + 1]) if traits_by_rarity[lower]),
+            "common"
+        )
+    return traits_by_rarity, rarity_fallback
+
+def pick_skills_for_adventurer(adventurer, rng, class_skills_by_class, universal_skills, first_aid):
+    """Pick appropriate skills based on class and randomness"""
+    class_skills = class_skills_by_class.get(adventurer.adventurer_class, [])
     
     # Determine number of skills based on seniority
-    skill_count = {
-        "junior": random.randint(2, 3),
-        "mid": random.randint(3, 4), 
-        "senior": random.randint(4, 6)
-    }[adventurer.seniority]
+    skill_count = rng.randint(*SKILL_COUNT_RANGES[adventurer.seniority])
     
     assigned_skills = []
     
     # Always get at least 1 class-specific skill if available
     if class_skills:
-        assigned_skills.append(random.choice(class_skills))
+        assigned_skills.append(rng.choice(class_skills))
         skill_count -= 1
     
     # Always get First Aid (universal healing)
-    first_aid = next((s for s in universal_skills if s.name == "First Aid"), None)
     if first_aid and first_aid not in assigned_skills:
         assigned_skills.append(first_aid)
         skill_count -= 1
@@ -110,76 +133,41 @@ def assign_skills_to_adventurer(db, adventurer, adventurer_class):
     available_skills = class_skills + universal_skills
     available_skills = [s for s in available_skills if s not in assigned_skills]
     
-    while skill_count > 0 and available_skills:
-        skill = random.choice(available_skills)
-        assigned_skills.append(skill)
-        available_skills.remove(skill)
-        skill_count -= 1
+    if skill_count > 0:
+        assigned_skills.extend(rng.sample(available_skills, min(skill_count, len(available_skills))))
     
-    # Assign skills to adventurer
-    for skill in assigned_skills:
-        adventurer.add_skill(skill)
+    return assigned_skills
 
-def assign_traits_to_adventurer(db, adventurer):
-    """Assign traits based on seniority and randomness"""
-    all_traits = db.query(Trait).all()
-    
-    # Filter traits by rarity for appropriate distribution
-    common_traits = [t for t in all_traits if t.rarity == "common"]
-    uncommon_traits = [t for t in all_traits if t.rarity == "uncommon"]
-    rare_traits = [t for t in all_traits if t.rarity == "rare"]
-    legendary_traits = [t for t in all_traits if t.rarity == "legendary"]
-    
+def pick_traits_for_adventurer(adventurer, rng, traits_by_rarity, rarity_fallback):
+    """Pick traits based on seniority and randomness"""
     # Determine number of traits based on seniority
-    trait_count = {
-        "junior": random.randint(1, 2),
-        "mid": random.randint(2, 3),
-        "senior": random.randint(3, 4)
-    }[adventurer.seniority]
+    trait_count = rng.randint(*TRAIT_COUNT_RANGES[adventurer.seniority])
     
-    assigned_traits = []
+    # Roll the rarity of every trait slot at once, redirecting empty rarities
+    slots_by_rarity = Counter(
+        rarity_fallback[rarity]
+        for rarity in rng.choices(TRAIT_RARITIES, weights=TRAIT_RARITY_WEIGHTS, k=trait_count)
+    )
     
-    for _ in range(trait_count):
-        # Weighted random selection based on rarity
-        rarity_roll = random.randint(1, 100)
-        
-        if rarity_roll <= 5 and legendary_traits:  # 5% legendary
-            trait_pool = legendary_traits
-        elif rarity_roll <= 20 and rare_traits:    # 15% rare  
-            trait_pool = rare_traits
-        elif rarity_roll <= 45 and uncommon_traits: # 25% uncommon
-            trait_pool = uncommon_traits
-        else:  # 55% common
-            trait_pool = common_traits
-        
-        # Remove already assigned traits from pool
-        available_traits = [t for t in trait_pool if t not in assigned_traits]
-        
-        if available_traits:
-            trait = random.choice(available_traits)
-            assigned_traits.append(trait)
+    assigned_traits = []
+    for rarity, slots in slots_by_rarity.items():
+        trait_pool = traits_by_rarity[rarity]
+        assigned_traits.extend(rng.sample(trait_pool, min(slots, len(trait_pool))))
     
-    # Assign traits to adventurer
-    for trait in assigned_traits:
-        adventurer.add_trait(trait)
+    return assigned_traits
 
-def generate_adventurer(db, game_session_id=None):
-    """Generate a single adventurer with appropriate stats, skills, and traits"""
-    
-    # Generate basic info
-    name = generate_adventurer_name()
-    adventurer_class = random.choice(["warrior", "archer", "mage", "paladin"])
-    seniority = random.choice(list(AdventurerSeniority)).value
+def generate_adventurer(name, adventurer_class, seniority, rng, game_session_id=None):
+    """Build a single adventurer with appropriate stats (no database access)"""
     role = Adventurer.get_role_for_class(adventurer_class)
     
     # Generate growth rates based on class and seniority
     growth_rates = Adventurer.generate_growth_rates(adventurer_class, seniority)
     
     # Generate base stats based on class and seniority
-    base_stats = generate_base_stats(adventurer_class, seniority)
+    base_stats = generate_base_stats(adventurer_class, seniority, rng)
     
     # Calculate hire cost based on seniority and total stats
-    seniority_cost = {"junior": 300, "mid": 500, "senior": 800}[seniority]
+    seniority_cost = SENIORITY_HIRE_COSTS[seniority]
     
     # Calculate stat bonus (higher stats = higher cost) - new 5-stat system
     stat_total = sum([
@@ -192,7 +180,7 @@ def generate_adventurer(db, game_session_id=None):
     hire_cost = seniority_cost + stat_bonus
     
     # Calculate weekly salary (typically 8-15% of hire cost)
-    base_salary = {"junior": 25, "mid": 45, "senior": 75}[seniority]
+    base_salary = SENIORITY_BASE_SALARIES[seniority]
     salary_stat_bonus = max(0, stat_total - expected_total) * 1
     weekly_salary = base_salary + salary_stat_bonus
     
@@ -208,51 +196,68 @@ def generate_adventurer(db, game_session_id=None):
         hire_cost=hire_cost,
         weekly_salary=weekly_salary,
         
-        # Base stats (new 5-stat system)
-        max_hp=base_stats["max_hp"],
-        current_hp=base_stats["current_hp"],
-        drive=base_stats["drive"],
-        efficiency=base_stats["efficiency"],
-        resilience=base_stats["resilience"],
-        insight=base_stats["insight"],
-        luck=base_stats["luck"],
-        
         # Condition stats (Uma Musume style)
-        morale=random.randint(60, 90),
-        stamina=random.randint(80, 100),
+        morale=rng.randint(60, 90),
+        stamina=rng.randint(80, 100),
         
-        # Growth rates
+        # Base stats (new 5-stat system, keys match the column names) and growth rates
+        **base_stats,
         **growth_rates
     )
     
-    db.add(adventurer)
-    db.flush()  # Get the ID for relationships
-    
-    # Assign skills and traits
-    assign_skills_to_adventurer(db, adventurer, adventurer_class)
-    assign_traits_to_adventurer(db, adventurer)
-    
     return adventurer
 
-def seed_adventurers_for_session(db, game_session_id, count=20):
-    """Generate a pool of adventurers for a specific game session"""
+def build_adventurer_pool(game_session_id, rng, count=20):
+    """Build a pool of adventurers for a game session without touching the database"""
     adventurers = []
     
     print(f"🧙‍♂️ Generating {count} adventurers for game session {game_session_id}...")
     
-    for i in range(count):
-        adventurer = generate_adventurer(db, game_session_id)
-        adventurers.append(adventurer)
+    # Roll names, classes and seniorities for the whole pool up front
+    first_names = rng.choices(FIRST_NAMES, k=count)
+    last_names = rng.choices(LAST_NAMES, k=count)
+    classes = rng.choices(ADVENTURER_CLASSES, k=count)
+    seniorities = rng.choices(SENIORITY_VALUES, k=count)
+    
+    for i, (first, last, adventurer_class, seniority) in enumerate(zip(first_names, last_names, classes, seniorities)):
+        adventurers.append(generate_adventurer(f"{first} {last}", adventurer_class, seniority, rng, game_session_id))
         
         if (i + 1) % 5 == 0:
             print(f"   Generated {i + 1}/{count} adventurers...")
     
-    db.commit()
-    print(f"✅ Generated {len(adventurers)} adventurers")
+    return adventurers
+
+def insert_adventurers(db, adventurers, rng, skill_pools, trait_pools):
+    """Insert adventurers with their skills and traits using a few bulk statements"""
+    # Insert every adventurer with a single flush to get the IDs
+    db.add_all(adventurers)
+    db.flush()
+    
+    # Assign skills and traits with one bulk insert per association table
+    skill_rows = []
+    trait_rows = []
+    for adventurer in adventurers:
+        for skill in pick_skills_for_adventurer(adventurer, rng, *skill_pools):
+            skill_rows.append({"adventurer_id": adventurer.id, "skill_id": skill.id})
+        for trait in pick_traits_for_adventurer(adventurer, rng, *trait_pools):
+            trait_rows.append({"adventurer_id": adventurer.id, "trait_id": trait.id})
+    
+    if skill_rows:
+        db.execute(insert(adventurer_skills), skill_rows)
+    if trait_rows:
+        db.execute(insert(adventurer_traits), trait_rows)
+
+def print_sample_adventurers(db, adventurers):
+    """Show the first few generated adventurers"""
+    # Load skills and traits for the samples in two queries instead of two per adventurer
+    sample_ids = [adv.id for adv in adventurers[:5]]
+    samples = db.query(Adventurer).options(
+        selectinload(Adventurer.skills),
+        selectinload(Adventurer.traits)
+    ).filter(Adventurer.id.in_(sample_ids)).order_by(Adventurer.id).all()
     
-    # Show some examples
     print("\n📋 Sample Generated Adventurers:")
-    for i, adv in enumerate(adventurers[:5]):
+    for i, adv in enumerate(samples):
         skills = [s.name for s in adv.skills]
         traits = [f"{t.name} ({t.rarity})" for t in adv.traits]
         stats = f"DRV:{adv.drive} EFF:{adv.efficiency} RES:{adv.resilience} INS:{adv.insight} LCK:{adv.luck}"
@@ -265,11 +270,26 @@ def seed_adventurers_for_session(db, game_session_id, count=20):
         print(f"      🗡️ Skills: {', '.join(skills)}")
         print(f"      ✨ Traits: {', '.join(traits)}")
         print()
+
+def seed_adventurers_for_session(db, game_session_id, count=20, verbose=False, seed=None):
+    """Generate a pool of adventurers for a specific game session"""
+    # A local generator keeps seeding reproducible for a given seed
+    rng = random.Random(seed)
     
+    adventurers = build_adventurer_pool(game_session_id, rng, count)
+    insert_adventurers(db, adventurers, rng, load_skill_pools(db), load_trait_pools(db))
+    db.commit()
+    print(f"✅ Generated {len(adventurers)} adventurers")
+    
+    if verbose:
+        print_sample_adventurers(db, adventurers)
     return adventurers
 
-def main():
+def main(verbose=False, seed=None):
     """Generate adventurers for all existing game sessions"""
+    # A local generator keeps seeding reproducible for a given seed
+    rng = random.Random(seed)
+    load_all()
     db = SessionLocal()
     try:
         # Get all game sessions
@@ -279,25 +299,33 @@ def main():
             print("❌ No game sessions found. Create a player and game session first.")
             return
         
-        total_generated = 0
+        adventurers = []
         
         for session in sessions:
-            # Check if session already has adventurers
-            existing_count = db.query(Adventurer).filter(
+            # Check if session already has adventurers (stops at the first match)
+            existing = db.query(Adventurer.id).filter(
                 Adventurer.game_session_id == session.id,
                 Adventurer.is_available == True
-            ).count()
+            ).first()
             
-            if existing_count > 0:
-                print(f"⏭️  Session {session.id} already has {existing_count} adventurers, skipping...")
+            if existing:
+                print(f"⏭️  Session {session.id} already has adventurers, skipping...")
                 continue
             
-            # Generate adventurers for this session
-            adventurers = seed_adventurers_for_session(db, session.id, 20)
-            total_generated += len(adventurers)
+            # Build adventurers for this session; everything is inserted together below
+            adventurers.extend(build_adventurer_pool(session.id, rng, 20))
+        
+        # Insert the pools of all sessions in one transaction, loading the
+        # skill and trait catalogs once for all of them
+        if adventurers:
+            insert_adventurers(db, adventurers, rng, load_skill_pools(db), load_trait_pools(db))
+            db.commit()
+            print(f"✅ Generated {len(adventurers)} adventurers")
+            if verbose:
+                print_sample_adventurers(db, adventurers)
         
         print(f"\n🎉 Adventurer generation complete!")
-        print(f"📊 Total adventurers generated: {total_generated}")
+        print(f"📊 Total adventurers generated: {len(adventurers)}")
         
     except Exception as e:
         db.rollback()
@@ -307,4 +335,4 @@ def main():
         db.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(verbose="--verbose" in sys.argv)
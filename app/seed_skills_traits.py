@@ -4,507 +4,643 @@ Seed Skills and Traits for GuildedIn
 Populates the database with initial skills and traits for adventurers
 """
 
+import io
+import struct
+from sqlalchemy import insert, text, Integer, SmallInteger
+from app.models import load_all
 from app.models.database import get_db, SessionLocal
-from app.models.adventurer import Skill, Trait
+from app.models.adventurer import Skill, SkillClassRestriction, Trait, ALL_POSITIONS, positions_mask
 
-def seed_skills():
-    """Create initial skills for adventurers"""
-    skills_data = [
-        # Fighter Skills
-        {
-            "name": "Shield Wall",
-            "description": "Creates a defensive barrier that blocks incoming attacks and protects nearby allies.",
-            "skill_type": "defensive",
-            "cooldown": 3,
-            "restricted_to_classes": "fighter,paladin",
-            "usable_positions": "1,2",  # Front and mid-front only
-            "target_type": "ally",
-            "target_positions": "1,2,3,4"  # Can protect all allies
-        },
-        {
-            "name": "Mighty Strike", 
-            "description": "A powerful melee attack that deals extra damage and has a chance to stun the target.",
-            "skill_type": "offensive",
-            "cooldown": 2,
-            "restricted_to_classes": "fighter,barbarian",
-            "usable_positions": "1,2",  # Need to be in melee range
-            "target_type": "enemy",
-            "target_positions": "1,2"  # Can only hit front enemies
-        },
-        {
-            "name": "Taunt",
-            "description": "Forces enemies to focus their attacks on this adventurer, protecting the team.",
-            "skill_type": "defensive", 
-            "cooldown": 1,
-            "restricted_to_classes": "fighter,paladin,barbarian",
-            "usable_positions": "1,2",  # Need to be visible to enemies
-            "target_type": "enemy",
-            "target_positions": "1,2,3,4"  # Can taunt any enemy
-        },
-        {
-            "name": "Battle Fury",
-            "description": "Increases attack speed and damage for a short duration when health drops below 50%.",
-            "skill_type": "offensive",
-            "cooldown": 4, 
-            "restricted_to_classes": "fighter,barbarian",
-            "usable_positions": "1,2,3,4",  # Self-buff, any position
-            "target_type": "self",
-            "target_positions": None
-        },
-        
-        # Rogue Skills
-        {
-            "name": "Stealth Strike",
-            "description": "Attack from the shadows with increased critical hit chance and damage.",
-            "skill_type": "offensive",
-            "cooldown": 3,
-            "restricted_to_classes": "rogue",
-            "usable_positions": "2,3,4",  # From behind, not front line
-            "target_type": "enemy",
-            "target_positions": "1,2"  # Sneak attack front enemies
-        },
-        {
-            "name": "Smoke Bomb",
-            "description": "Create a smoke cloud that reduces enemy accuracy and provides cover for the team.",
-            "skill_type": "utility",
-            "cooldown": 4,
-            "restricted_to_classes": "rogue"
-        },
-        {
-            "name": "Lockpicking",
-            "description": "Open locked treasure chests and doors during dungeon exploration.",
-            "skill_type": "utility",
-            "cooldown": 0,
-            "restricted_to_classes": "rogue"
-        },
-        
-        # Mage Skills
-        {
-            "name": "Fireball",
-            "description": "Launch a devastating fireball that deals area damage to multiple enemies.",
-            "skill_type": "offensive",
-            "cooldown": 2,
-            "restricted_to_classes": "mage",
-            "usable_positions": "3,4",  # Back line casting
-            "target_type": "enemy", 
-            "target_positions": "1,2,3,4"  # Long range, can hit any enemy
-        },
-        {
-            "name": "Ice Shield",
-            "description": "Create a magical barrier that absorbs damage and slows attacking enemies.",
-            "skill_type": "defensive",
-            "cooldown": 3,
-            "restricted_to_classes": "mage"
-        },
-        {
-            "name": "Arcane Missile",
-            "description": "Fire multiple homing projectiles that never miss their target.",
-            "skill_type": "offensive",
-            "cooldown": 1,
-            "restricted_to_classes": "mage"
-        },
-        
-        # Cleric Skills
-        {
-            "name": "Heal",
-            "description": "Restore health to a single ally, removing minor debuffs.",
-            "skill_type": "healing",
-            "cooldown": 1,
-            "restricted_to_classes": "cleric,druid",
-            "usable_positions": "2,3,4",  # Support from mid/back
-            "target_type": "ally",
-            "target_positions": "1,2,3,4"  # Can heal anyone
-        },
-        {
-            "name": "Mass Heal",
-            "description": "Restore health to all party members simultaneously.",
-            "skill_type": "healing",
-            "cooldown": 4,
-            "restricted_to_classes": "cleric",
-            "usable_positions": "3,4",  # Powerful magic from back line
-            "target_type": "ally",
-            "target_positions": "1,2,3,4"  # Affects whole party
-        },
-        {
-            "name": "Divine Protection",
-            "description": "Grant temporary immunity to debuffs and increased resistance to damage.",
-            "skill_type": "defensive",
-            "cooldown": 5,
-            "restricted_to_classes": "cleric,paladin"
-        },
-        
-        # Archer Skills
-        {
-            "name": "Precision Shot",
-            "description": "A carefully aimed shot that ignores armor and has increased critical chance.",
-            "skill_type": "offensive",
-            "cooldown": 2,
-            "restricted_to_classes": "archer"
-        },
-        {
-            "name": "Rain of Arrows",
-            "description": "Fire multiple arrows that strike all enemies in the area.",
-            "skill_type": "offensive",
-            "cooldown": 4,
-            "restricted_to_classes": "archer"
-        },
-        {
-            "name": "Eagle Eye",
-            "description": "Increase accuracy and critical hit rate for several turns.",
-            "skill_type": "utility",
-            "cooldown": 3,
-            "restricted_to_classes": "archer"
-        },
-        
-        # Universal Skills (no class restrictions)
-        {
-            "name": "First Aid",
-            "description": "Basic healing that any adventurer can perform to restore minor health.",
-            "skill_type": "healing",
-            "cooldown": 2,
-            "restricted_to_classes": None,
-            "usable_positions": "1,2,3,4",  # Anyone can use
-            "target_type": "ally", 
-            "target_positions": "1,2,3,4"  # Can heal any ally
-        },
-        {
-            "name": "Dodge Roll",
-            "description": "Quick evasive maneuver that increases dodge chance for one turn.",
-            "skill_type": "defensive",
-            "cooldown": 3,
-            "restricted_to_classes": None
-        },
-        {
-            "name": "Focus",
-            "description": "Concentrate to increase accuracy and reduce skill cooldowns.",
-            "skill_type": "utility",
-            "cooldown": 4,
-            "restricted_to_classes": None
-        }
+# Defaults merged into every seed row that doesn't specify them
+SKILL_DEFAULTS = {
+    "usable_positions": ALL_POSITIONS,  # Default: can use from any position
+    "target_type": "enemy",  # Default: targets enemies
+    "target_positions": None,  # Default: can target any position of target_type
+}
+TRAIT_DEFAULTS = {"effect_type": "positive"}
+
+# Initial skills for adventurers
+SKILLS_DATA = (
+    # Fighter Skills
+    {
+        "name": "Shield Wall",
+        "description": "Creates a defensive barrier that blocks incoming attacks and protects nearby allies.",
+        "skill_type": "defensive",
+        "cooldown": 3,
+        "restricted_to_classes": "fighter,paladin",
+        "usable_positions": positions_mask(1, 2),  # Front and mid-front only
+        "target_type": "ally",
+        "target_positions": ALL_POSITIONS  # Can protect all allies
+    },
+    {
+        "name": "Mighty Strike", 
+        "description": "A powerful melee attack that deals extra damage and has a chance to stun the target.",
+        "skill_type": "offensive",
+        "cooldown": 2,
+        "restricted_to_classes": "fighter,barbarian",
+        "usable_positions": positions_mask(1, 2),  # Need to be in melee range
+        "target_type": "enemy",
+        "target_positions": positions_mask(1, 2)  # Can only hit front enemies
+    },
+    {
+        "name": "Taunt",
+        "description": "Forces enemies to focus their attacks on this adventurer, protecting the team.",
+        "skill_type": "defensive", 
+        "cooldown": 1,
+        "restricted_to_classes": "fighter,paladin,barbarian",
+        "usable_positions": positions_mask(1, 2),  # Need to be visible to enemies
+        "target_type": "enemy",
+        "target_positions": ALL_POSITIONS  # Can taunt any enemy
+    },
+    {
+        "name": "Battle Fury",
+        "description": "Increases attack speed and damage for a short duration when health drops below 50%.",
+        "skill_type": "offensive",
+        "cooldown": 4, 
+        "restricted_to_classes": "fighter,barbarian",
+        "usable_positions": ALL_POSITIONS,  # Self-buff, any position
+        "target_type": "self",
+        "target_positions": None
+    },
+    
+    # Rogue Skills
+    {
+        "name": "Stealth Strike",
+        "description": "Attack from the shadows with increased critical hit chance and damage.",
+        "skill_type": "offensive",
+        "cooldown": 3,
+        "restricted_to_classes": "rogue",
+        "usable_positions": positions_mask(2, 3, 4),  # From behind, not front line
+        "target_type": "enemy",
+        "target_positions": positions_mask(1, 2)  # Sneak attack front enemies
+    },
+    {
+        "name": "Smoke Bomb",
+        "description": "Create a smoke cloud that reduces enemy accuracy and provides cover for the team.",
+        "skill_type": "utility",
+        "cooldown": 4,
+        "restricted_to_classes": "rogue"
+    },
+    {
+        "name": "Lockpicking",
+        "description": "Open locked treasure chests and doors during dungeon exploration.",
+        "skill_type": "utility",
+        "cooldown": 0,
+        "restricted_to_classes": "rogue"
+    },
+    
+    # Mage Skills
+    {
+        "name": "Fireball",
+        "description": "Launch a devastating fireball that deals area damage to multiple enemies.",
+        "skill_type": "offensive",
+        "cooldown": 2,
+        "restricted_to_classes": "mage",
+        "usable_positions": positions_mask(3, 4),  # Back line casting
+        "target_type": "enemy", 
+        "target_positions": ALL_POSITIONS  # Long range, can hit any enemy
+    },
+    {
+        "name": "Ice Shield",
+        "description": "Create a magical barrier that absorbs damage and slows attacking enemies.",
+        "skill_type": "defensive",
+        "cooldown": 3,
+        "restricted_to_classes": "mage"
+    },
+    {
+        "name": "Arcane Missile",
+        "description": "Fire multiple homing projectiles that never miss their target.",
+        "skill_type": "offensive",
+        "cooldown": 1,
+        "restricted_to_classes": "mage"
+    },
+    
+    # Cleric Skills
+    {
+        "name": "Heal",
+        "description": "Restore health to a single ally, removing minor debuffs.",
+        "skill_type": "healing",
+        "cooldown": 1,
+        "restricted_to_classes": "cleric,druid",
+        "usable_positions": positions_mask(2, 3, 4),  # Support from mid/back
+        "target_type": "ally",
+        "target_positions": ALL_POSITIONS  # Can heal anyone
+    },
+    {
+        "name": "Mass Heal",
+        "description": "Restore health to all party members simultaneously.",
+        "skill_type": "healing",
+        "cooldown": 4,
+        "restricted_to_classes": "cleric",
+        "usable_positions": positions_mask(3, 4),  # Powerful magic from back line
+        "target_type": "ally",
+        "target_positions": ALL_POSITIONS  # Affects whole party
+    },
+    {
+        "name": "Divine Protection",
+        "description": "Grant temporary immunity to debuffs and increased resistance to damage.",
+        "skill_type": "defensive",
+        "cooldown": 5,
+        "restricted_to_classes": "cleric,paladin"
+    },
+    
+    # Archer Skills
+    {
+        "name": "Precision Shot",
+        "description": "A carefully aimed shot that ignores armor and has increased critical chance.",
+        "skill_type": "offensive",
+        "cooldown": 2,
+        "restricted_to_classes": "archer"
+    },
+    {
+        "name": "Rain of Arrows",
+        "description": "Fire multiple arrows that strike all enemies in the area.",
+        "skill_type": "offensive",
+        "cooldown": 4,
+        "restricted_to_classes": "archer"
+    },
+    {
+        "name": "Eagle Eye",
+        "description": "Increase accuracy and critical hit rate for several turns.",
+        "skill_type": "utility",
+        "cooldown": 3,
+        "restricted_to_classes": "archer"
+    },
+    
+    # Universal Skills (no class restrictions)
+    {
+        "name": "First Aid",
+        "description": "Basic healing that any adventurer can perform to restore minor health.",
+        "skill_type": "healing",
+        "cooldown": 2,
+        "restricted_to_classes": None,
+        "usable_positions": ALL_POSITIONS,  # Anyone can use
+        "target_type": "ally", 
+        "target_positions": ALL_POSITIONS  # Can heal any ally
+    },
+    {
+        "name": "Dodge Roll",
+        "description": "Quick evasive maneuver that increases dodge chance for one turn.",
+        "skill_type": "defensive",
+        "cooldown": 3,
+        "restricted_to_classes": None
+    },
+    {
+        "name": "Focus",
+        "description": "Concentrate to increase accuracy and reduce skill cooldowns.",
+        "skill_type": "utility",
+        "cooldown": 4,
+        "restricted_to_classes": None
+    }
+)
+
+# Initial traits for adventurers
+TRAITS_DATA = (
+    # Combat Traits
+    {
+        "name": "Veteran Leadership",
+        "description": "Provides +10% experience gain to all party members during dungeon expeditions.",
+        "trait_type": "combat",
+        "bonus_value": 10,
+        "bonus_type": "percentage",
+        "effect_type": "positive",
+        "rarity": "uncommon"
+    },
+    {
+        "name": "Iron Will",
+        "description": "Immune to fear and charm effects. Reduces duration of all negative status effects by 50%.",
+        "trait_type": "combat",
+        "bonus_value": 50,
+        "bonus_type": "percentage",
+        "rarity": "rare"
+    },
+    {
+        "name": "Heavy Armor Mastery",
+        "description": "Reduces physical damage taken by 20% and negates movement penalties from heavy armor.",
+        "trait_type": "combat",
+        "bonus_value": 20,
+        "bonus_type": "percentage",
+        "rarity": "common"
+    },
+    {
+        "name": "Berserker Rage",
+        "description": "Deal 25% more damage when health is below 30%, but take 15% more damage.",
+        "trait_type": "combat",
+        "bonus_value": 25,
+        "bonus_type": "percentage",
+        "rarity": "uncommon"
+    },
+    {
+        "name": "Lucky",
+        "description": "15% chance to avoid any negative effect, including damage, debuffs, and traps.",
+        "trait_type": "combat",
+        "bonus_value": 15,
+        "bonus_type": "percentage",
+        "rarity": "rare"
+    },
+    {
+        "name": "Quick Reflexes",
+        "description": "Always act first in combat rounds and +10% dodge chance.",
+        "trait_type": "combat",
+        "bonus_value": 10,
+        "bonus_type": "percentage",
+        "rarity": "uncommon"
+    },
+    
+    # Economic Traits
+    {
+        "name": "Treasure Hunter",
+        "description": "Find 20% more gold and has a chance to discover rare items in dungeons.",
+        "trait_type": "economic",
+        "bonus_value": 20,
+        "bonus_type": "percentage",
+        "rarity": "common"
+    },
+    {
+        "name": "Merchant Background",
+        "description": "Equipment and supplies cost 15% less when purchased for this adventurer.",
+        "trait_type": "economic",
+        "bonus_value": 15,
+        "bonus_type": "percentage",
+        "rarity": "common"
+    },
+    {
+        "name": "Goldsniff",
+        "description": "Can detect hidden treasure rooms and secret passages containing valuable loot.",
+        "trait_type": "economic",
+        "bonus_value": 0,
+        "bonus_type": "special",
+        "rarity": "rare"
+    },
+    
+    # Training Traits
+    {
+        "name": "Fast Learner",
+        "description": "Gains experience 25% faster from all activities including combat and training.",
+        "trait_type": "training",
+        "bonus_value": 25,
+        "bonus_type": "percentage",
+        "rarity": "uncommon"
+    },
+    {
+        "name": "Mentor",
+        "description": "Other adventurers in the same guild gain +15% experience when training together.",
+        "trait_type": "training",
+        "bonus_value": 15,
+        "bonus_type": "percentage",
+        "rarity": "rare"
+    },
+    
+    # Social Traits
+    {
+        "name": "Charismatic",
+        "description": "Improves team morale and reduces chance of adventurers leaving the guild.",
+        "trait_type": "social",
+        "bonus_value": 25,
+        "bonus_type": "percentage",
+        "rarity": "common"
+    },
+    {
+        "name": "Inspiring Presence",
+        "description": "All party members gain +5% to all stats when this adventurer is present.",
+        "trait_type": "social",
+        "bonus_value": 5,
+        "bonus_type": "percentage",
+        "rarity": "legendary"
+    },
+    {
+        "name": "Loyal",
+        "description": "Will never leave the guild voluntarily and provides stability bonus to other adventurers.",
+        "trait_type": "social",
+        "bonus_value": 0,
+        "bonus_type": "special",
+        "rarity": "uncommon"
+    },
+    {
+        "name": "Rival",
+        "description": "Performs better when another specific adventurer is not in the same party.",
+        "trait_type": "social",
+        "bonus_value": 20,
+        "bonus_type": "percentage",
+        "rarity": "common"
+    },
+    
+    # Legendary Traits
+    {
+        "name": "Phoenix Heart",
+        "description": "Once per dungeon, automatically revive with 50% health when defeated.",
+        "trait_type": "combat",
+        "bonus_value": 50,
+        "bonus_type": "percentage",
+        "rarity": "legendary"
+    },
+    {
+        "name": "Master of Arms",
+        "description": "Can use any skill regardless of class restrictions, but with 20% reduced effectiveness.",
+        "trait_type": "combat",
+        "bonus_value": 20,
+        "bonus_type": "percentage",
+        "rarity": "legendary"
+    },
+    {
+        "name": "Guild Legend",
+        "description": "Increases guild share price by 10% just by being part of the roster.",
+        "trait_type": "economic",
+        "bonus_value": 10,
+        "bonus_type": "percentage",
+        "effect_type": "positive",
+        "rarity": "legendary"
+    },
+    
+    # Negative Traits
+    {
+        "name": "Slow Healer",
+        "description": "Recovers from injuries 40% slower and receives 25% less healing from all sources.",
+        "trait_type": "combat",
+        "bonus_value": -40,
+        "bonus_type": "healing_rate",
+        "penalty_value": 25,
+        "penalty_type": "healing_received",
+        "effect_type": "negative",
+        "rarity": "common"
+    },
+    {
+        "name": "Fragile",
+        "description": "Takes 20% more damage from all sources due to poor constitution.",
+        "trait_type": "combat",
+        "bonus_value": -20,
+        "bonus_type": "damage_resistance",
+        "effect_type": "negative", 
+        "rarity": "common"
+    },
+    {
+        "name": "Coward",
+        "description": "Flees from combat when health drops below 60%, abandoning the party.",
+        "trait_type": "combat",
+        "bonus_value": 0,
+        "bonus_type": "special",
+        "effect_type": "negative",
+        "rarity": "uncommon"
+    },
+    {
+        "name": "Expensive Tastes",
+        "description": "Demands 50% higher salary and premium equipment, draining guild resources.",
+        "trait_type": "economic", 
+        "bonus_value": -50,
+        "bonus_type": "salary_cost",
+        "effect_type": "negative",
+        "rarity": "common"
+    },
+    {
+        "name": "Antisocial",
+        "description": "Reduces team morale and prevents other adventurers from gaining synergy bonuses.",
+        "trait_type": "social",
+        "bonus_value": -30,
+        "bonus_type": "morale",
+        "effect_type": "negative",
+        "rarity": "uncommon"
+    },
+    
+    # Mixed Traits (Positive + Negative)
+    {
+        "name": "Berserker's Curse",
+        "description": "Deals 40% more damage but takes 25% more damage and cannot be healed during combat.",
+        "trait_type": "combat",
+        "bonus_value": 40,
+        "bonus_type": "damage_dealt",
+        "penalty_value": 25, 
+        "penalty_type": "damage_taken",
+        "effect_type": "mixed",
+        "rarity": "rare"
+    },
+    {
+        "name": "Perfectionist",
+        "description": "Training provides 30% better results but costs 50% more gold due to demanding standards.",
+        "trait_type": "training",
+        "bonus_value": 30,
+        "bonus_type": "training_effectiveness",
+        "penalty_value": 50,
+        "penalty_type": "training_cost", 
+        "effect_type": "mixed",
+        "rarity": "uncommon"
+    },
+    {
+        "name": "Lucky Fool",
+        "description": "15% chance to avoid negative effects, but 20% chance to fail when using skills.",
+        "trait_type": "combat", 
+        "bonus_value": 15,
+        "bonus_type": "avoid_negative",
+        "penalty_value": 20,
+        "penalty_type": "skill_failure",
+        "effect_type": "mixed",
+        "rarity": "rare"
+    },
+    {
+        "name": "Natural Born Leader",
+        "description": "Provides +20% experience to party but becomes unavailable if not made party leader.",
+        "trait_type": "social",
+        "bonus_value": 20,
+        "bonus_type": "party_experience",
+        "penalty_value": 0,
+        "penalty_type": "leadership_requirement",
+        "effect_type": "mixed",
+        "rarity": "rare"
+    },
+    {
+        "name": "Treasure Obsessed", 
+        "description": "Finds 35% more gold in dungeons but refuses to share loot with party members.",
+        "trait_type": "economic",
+        "bonus_value": 35,
+        "bonus_type": "gold_found",
+        "penalty_value": 100,
+        "penalty_type": "loot_sharing",
+        "effect_type": "mixed", 
+        "rarity": "uncommon"
+    }
+)
+
+# PostgreSQL binary COPY framing: signature, flags and header extension length
+_PGCOPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_PGCOPY_TRAILER = struct.pack(">h", -1)
+
+def _binary_field(column, value):
+    """Encode one field for binary COPY: length prefix plus the value in wire format"""
+    if value is None:
+        return struct.pack(">i", -1)
+    if isinstance(column.type, SmallInteger):
+        return struct.pack(">ih", 2, value)
+    if isinstance(column.type, Integer):
+        return struct.pack(">ii", 4, value)
+    data = str(value).encode()
+    return struct.pack(">i", len(data)) + data
+
+def _row_values(columns, row):
+    """Values for every column, filling in Python-side defaults the row omits"""
+    return [
+        row.get(column.name, column.default.arg if column.default is not None else None)
+        for column in columns
     ]
+
+def copy_rows(db, table, rows, target=None):
+    """Stream rows into a PostgreSQL table with a single binary COPY FROM STDIN"""
+    columns = [column for column in table.columns if not column.primary_key]
+    tuple_header = struct.pack(">h", len(columns))
     
-    db = SessionLocal()
+    buf = io.BytesIO()
+    buf.write(_PGCOPY_HEADER)
+    for row in rows:
+        buf.write(tuple_header)
+        for column, value in zip(columns, _row_values(columns, row)):
+            buf.write(_binary_field(column, value))
+    buf.write(_PGCOPY_TRAILER)
+    buf.seek(0)
+    
+    # Raw psycopg2 cursor on the session's connection, so the COPY joins its transaction
+    cursor = db.connection().connection.cursor()
+    column_names = ", ".join(column.name for column in columns)
+    cursor.copy_expert(f"COPY {target or table.name} ({column_names}) FROM STDIN WITH (FORMAT BINARY)", buf)
+
+def stage_and_merge_rows(db, table, rows):
+    """COPY rows into a temporary staging table and merge the new names server-side"""
+    stage = f"{table.name}_stage"
+    column_names = ", ".join(column.name for column in table.columns if not column.primary_key)
+    
+    # Temp tables skip WAL and carry no indexes; dropped again at commit
+    db.execute(text(
+        f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+        f"SELECT {column_names} FROM {table.name} WITH NO DATA"
+    ))
+    copy_rows(db, table, rows, target=stage)
+    db.execute(text(
+        f"INSERT INTO {table.name} ({column_names}) "
+        f"SELECT {column_names} FROM {stage} ON CONFLICT (name) DO NOTHING"
+    ))
+
+def all_rows_exist(db, model, rows):
+    """Whether every seed row's name is already in the table, in one COUNT query"""
+    names = [row["name"] for row in rows]
+    return db.query(model).filter(model.name.in_(names)).count() == len(names)
+
+def insert_new_rows(db, model, rows):
+    """Insert rows whose name is not in the table yet"""
+    table = model.__table__
+    if db.get_bind().dialect.name == "postgresql":
+        # The unique name index does the existence check in the merge
+        stage_and_merge_rows(db, table, rows)
+        return
+    
+    # One IN query for all candidate names instead of a lookup per row
+    names = [row["name"] for row in rows]
+    existing = {name for (name,) in db.query(model.name).filter(model.name.in_(names)).all()}
+    new_rows = [row for row in rows if row["name"] not in existing]
+    if not new_rows:
+        return
+    
+    # Core executemany skips the ORM unit of work; every row needs the same keys
+    columns = [column for column in table.columns if not column.primary_key]
+    column_names = [column.name for column in columns]
+    db.execute(insert(table), [dict(zip(column_names, _row_values(columns, row))) for row in new_rows])
+
+def insert_class_restrictions(db, skill_rows):
+    """Create the missing class restriction rows for seeded skills"""
+    names = [row["name"] for row in skill_rows]
+    skill_ids = dict(db.query(Skill.name, Skill.id).filter(Skill.name.in_(names)).all())
+    existing = set(
+        db.query(SkillClassRestriction.skill_id, SkillClassRestriction.adventurer_class)
+        .filter(SkillClassRestriction.skill_id.in_(skill_ids.values()))
+        .all()
+    )
+    
+    # restricted_to_classes in the seed data is a comma-separated list, or None for all classes
+    new_rows = []
+    for row in skill_rows:
+        if not row.get("restricted_to_classes"):
+            continue
+        skill_id = skill_ids[row["name"]]
+        for adventurer_class in dict.fromkeys(c.strip() for c in row["restricted_to_classes"].split(",")):
+            if (skill_id, adventurer_class) not in existing:
+                new_rows.append({"skill_id": skill_id, "adventurer_class": adventurer_class})
+    
+    if new_rows:
+        db.execute(insert(SkillClassRestriction.__table__), new_rows)
+
+def seed_skills(db=None):
+    """Create initial skills for adventurers (commits only when it opens its own session)"""
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
     try:
-        for skill_data in skills_data:
-            # Set default positioning for skills that don't have it specified
-            if "usable_positions" not in skill_data:
-                skill_data["usable_positions"] = "1,2,3,4"  # Default: can use from any position
-            if "target_type" not in skill_data:
-                skill_data["target_type"] = "enemy"  # Default: targets enemies
-            if "target_positions" not in skill_data:
-                skill_data["target_positions"] = None  # Default: can target any position of target_type
-                
-            # Check if skill already exists
-            existing_skill = db.query(Skill).filter(Skill.name == skill_data["name"]).first()
-            if not existing_skill:
-                skill = Skill(**skill_data)
-                db.add(skill)
+        # Fast path for re-runs against an already seeded database
+        if all_rows_exist(db, Skill, SKILLS_DATA):
+            print("✅ Skills already seeded, skipping")
+            return
         
-        db.commit()
-        print(f"✅ Seeded {len(skills_data)} skills")
+        # Skip skills that already exist and write the rest in one go
+        skill_rows = [{**SKILL_DEFAULTS, **skill_data} for skill_data in SKILLS_DATA]
+        insert_new_rows(db, Skill, skill_rows)
+        insert_class_restrictions(db, skill_rows)
+        if owns_session:
+            db.commit()
+        print(f"✅ Seeded {len(SKILLS_DATA)} skills")
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Error seeding skills: {e}")
+        if not owns_session:
+            raise
+        db.rollback()
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
-def seed_traits():
-    """Create initial traits for adventurers"""
-    traits_data = [
-        # Combat Traits
-        {
-            "name": "Veteran Leadership",
-            "description": "Provides +10% experience gain to all party members during dungeon expeditions.",
-            "trait_type": "combat",
-            "bonus_value": 10,
-            "bonus_type": "percentage",
-            "effect_type": "positive",
-            "rarity": "uncommon"
-        },
-        {
-            "name": "Iron Will",
-            "description": "Immune to fear and charm effects. Reduces duration of all negative status effects by 50%.",
-            "trait_type": "combat",
-            "bonus_value": 50,
-            "bonus_type": "percentage",
-            "rarity": "rare"
-        },
-        {
-            "name": "Heavy Armor Mastery",
-            "description": "Reduces physical damage taken by 20% and negates movement penalties from heavy armor.",
-            "trait_type": "combat",
-            "bonus_value": 20,
-            "bonus_type": "percentage",
-            "rarity": "common"
-        },
-        {
-            "name": "Berserker Rage",
-            "description": "Deal 25% more damage when health is below 30%, but take 15% more damage.",
-            "trait_type": "combat",
-            "bonus_value": 25,
-            "bonus_type": "percentage",
-            "rarity": "uncommon"
-        },
-        {
-            "name": "Lucky",
-            "description": "15% chance to avoid any negative effect, including damage, debuffs, and traps.",
-            "trait_type": "combat",
-            "bonus_value": 15,
-            "bonus_type": "percentage",
-            "rarity": "rare"
-        },
-        {
-            "name": "Quick Reflexes",
-            "description": "Always act first in combat rounds and +10% dodge chance.",
-            "trait_type": "combat",
-            "bonus_value": 10,
-            "bonus_type": "percentage",
-            "rarity": "uncommon"
-        },
-        
-        # Economic Traits
-        {
-            "name": "Treasure Hunter",
-            "description": "Find 20% more gold and has a chance to discover rare items in dungeons.",
-            "trait_type": "economic",
-            "bonus_value": 20,
-            "bonus_type": "percentage",
-            "rarity": "common"
-        },
-        {
-            "name": "Merchant Background",
-            "description": "Equipment and supplies cost 15% less when purchased for this adventurer.",
-            "trait_type": "economic",
-            "bonus_value": 15,
-            "bonus_type": "percentage",
-            "rarity": "common"
-        },
-        {
-            "name": "Goldsniff",
-            "description": "Can detect hidden treasure rooms and secret passages containing valuable loot.",
-            "trait_type": "economic",
-            "bonus_value": 0,
-            "bonus_type": "special",
-            "rarity": "rare"
-        },
-        
-        # Training Traits
-        {
-            "name": "Fast Learner",
-            "description": "Gains experience 25% faster from all activities including combat and training.",
-            "trait_type": "training",
-            "bonus_value": 25,
-            "bonus_type": "percentage",
-            "rarity": "uncommon"
-        },
-        {
-            "name": "Mentor",
-            "description": "Other adventurers in the same guild gain +15% experience when training together.",
-            "trait_type": "training",
-            "bonus_value": 15,
-            "bonus_type": "percentage",
-            "rarity": "rare"
-        },
-        
-        # Social Traits
-        {
-            "name": "Charismatic",
-            "description": "Improves team morale and reduces chance of adventurers leaving the guild.",
-            "trait_type": "social",
-            "bonus_value": 25,
-            "bonus_type": "percentage",
-            "rarity": "common"
-        },
-        {
-            "name": "Inspiring Presence",
-            "description": "All party members gain +5% to all stats when this adventurer is present.",
-            "trait_type": "social",
-            "bonus_value": 5,
-            "bonus_type": "percentage",
-            "rarity": "legendary"
-        },
-        {
-            "name": "Loyal",
-            "description": "Will never leave the guild voluntarily and provides stability bonus to other adventurers.",
-            "trait_type": "social",
-            "bonus_value": 0,
-            "bonus_type": "special",
-            "rarity": "uncommon"
-        },
-        {
-            "name": "Rival",
-            "description": "Performs better when another specific adventurer is not in the same party.",
-            "trait_type": "social",
-            "bonus_value": 20,
-            "bonus_type": "percentage",
-            "rarity": "common"
-        },
-        
-        # Legendary Traits
-        {
-            "name": "Phoenix Heart",
-            "description": "Once per dungeon, automatically revive with 50% health when defeated.",
-            "trait_type": "combat",
-            "bonus_value": 50,
-            "bonus_type": "percentage",
-            "rarity": "legendary"
-        },
-        {
-            "name": "Master of Arms",
-            "description": "Can use any skill regardless of class restrictions, but with 20% reduced effectiveness.",
-            "trait_type": "combat",
-            "bonus_value": 20,
-            "bonus_type": "percentage",
-            "rarity": "legendary"
-        },
-        {
-            "name": "Guild Legend",
-            "description": "Increases guild share price by 10% just by being part of the roster.",
-            "trait_type": "economic",
-            "bonus_value": 10,
-            "bonus_type": "percentage",
-            "effect_type": "positive",
-            "rarity": "legendary"
-        },
-        
-        # Negative Traits
-        {
-            "name": "Slow Healer",
-            "description": "Recovers from injuries 40% slower and receives 25% less healing from all sources.",
-            "trait_type": "combat",
-            "bonus_value": -40,
-            "bonus_type": "healing_rate",
-            "penalty_value": 25,
-            "penalty_type": "healing_received",
-            "effect_type": "negative",
-            "rarity": "common"
-        },
-        {
-            "name": "Fragile",
-            "description": "Takes 20% more damage from all sources due to poor constitution.",
-            "trait_type": "combat",
-            "bonus_value": -20,
-            "bonus_type": "damage_resistance",
-            "effect_type": "negative", 
-            "rarity": "common"
-        },
-        {
-            "name": "Coward",
-            "description": "Flees from combat when health drops below 60%, abandoning the party.",
-            "trait_type": "combat",
-            "bonus_value": 0,
-            "bonus_type": "special",
-            "effect_type": "negative",
-            "rarity": "uncommon"
-        },
-        {
-            "name": "Expensive Tastes",
-            "description": "Demands 50% higher salary and premium equipment, draining guild resources.",
-            "trait_type": "economic", 
-            "bonus_value": -50,
-            "bonus_type": "salary_cost",
-            "effect_type": "negative",
-            "rarity": "common"
-        },
-        {
-            "name": "Antisocial",
-            "description": "Reduces team morale and prevents other adventurers from gaining synergy bonuses.",
-            "trait_type": "social",
-            "bonus_value": -30,
-            "bonus_type": "morale",
-            "effect_type": "negative",
-            "rarity": "uncommon"
-        },
-        
-        # Mixed Traits (Positive + Negative)
-        {
-            "name": "Berserker's Curse",
-            "description": "Deals 40% more damage but takes 25% more damage and cannot be healed during combat.",
-            "trait_type": "combat",
-            "bonus_value": 40,
-            "bonus_type": "damage_dealt",
-            "penalty_value": 25, 
-            "penalty_type": "damage_taken",
-            "effect_type": "mixed",
-            "rarity": "rare"
-        },
-        {
-            "name": "Perfectionist",
-            "description": "Training provides 30% better results but costs 50% more gold due to demanding standards.",
-            "trait_type": "training",
-            "bonus_value": 30,
-            "bonus_type": "training_effectiveness",
-            "penalty_value": 50,
-            "penalty_type": "training_cost", 
-            "effect_type": "mixed",
-            "rarity": "uncommon"
-        },
-        {
-            "name": "Lucky Fool",
-            "description": "15% chance to avoid negative effects, but 20% chance to fail when using skills.",
-            "trait_type": "combat", 
-            "bonus_value": 15,
-            "bonus_type": "avoid_negative",
-            "penalty_value": 20,
-            "penalty_type": "skill_failure",
-            "effect_type": "mixed",
-            "rarity": "rare"
-        },
-        {
-            "name": "Natural Born Leader",
-            "description": "Provides +20% experience to party but becomes unavailable if not made party leader.",
-            "trait_type": "social",
-            "bonus_value": 20,
-            "bonus_type": "party_experience",
-            "penalty_value": 0,
-            "penalty_type": "leadership_requirement",
-            "effect_type": "mixed",
-            "rarity": "rare"
-        },
-        {
-            "name": "Treasure Obsessed", 
-            "description": "Finds 35% more gold in dungeons but refuses to share loot with party members.",
-            "trait_type": "economic",
-            "bonus_value": 35,
-            "bonus_type": "gold_found",
-            "penalty_value": 100,
-            "penalty_type": "loot_sharing",
-            "effect_type": "mixed", 
-            "rarity": "uncommon"
-        }
-    ]
-    
-    db = SessionLocal()
+def seed_traits(db=None):
+    """Create initial traits for adventurers (commits only when it opens its own session)"""
+    owns_session = db is None
+    if owns_session:
+        db = SessionLocal()
     try:
-        for trait_data in traits_data:
-            # Set default effect_type for traits that don't have it specified
-            if "effect_type" not in trait_data:
-                trait_data["effect_type"] = "positive"
-            
-            # Check if trait already exists
-            existing_trait = db.query(Trait).filter(Trait.name == trait_data["name"]).first()
-            if not existing_trait:
-                trait = Trait(**trait_data)
-                db.add(trait)
+        # Fast path for re-runs against an already seeded database
+        if all_rows_exist(db, Trait, TRAITS_DATA):
+            print("✅ Traits already seeded, skipping")
+            return
         
-        db.commit()
-        print(f"✅ Seeded {len(traits_data)} traits")
+        # Skip traits that already exist and write the rest in one go
+        insert_new_rows(db, Trait, [{**TRAIT_DEFAULTS, **trait_data} for trait_data in TRAITS_DATA])
+        if owns_session:
+            db.commit()
+        print(f"✅ Seeded {len(TRAITS_DATA)} traits")
         
     except Exception as e:
-        db.rollback()
         print(f"❌ Error seeding traits: {e}")
+        if not owns_session:
+            raise
+        db.rollback()
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 def main():
     """Seed skills and traits"""
     print("🌱 Seeding Skills and Traits...")
+    load_all()
     
-    seed_skills()
-    seed_traits()
+    # One transaction for the whole seed; on PostgreSQL skip waiting for the
+    # WAL flush at commit, since a lost seed can simply be re-run
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SET LOCAL synchronous_commit = off"))
+        
+        seed_skills(db)
+        seed_traits(db)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error seeding skills and traits: {e}")
+        raise
+    finally:
+        db.close()
     
     print("✅ Skills and Traits seeding complete!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,66 @@
+"""
+Query budget for the dashboard: the current-player dependency eager-loads
+everything the page renders, so a request must stay within a fixed number
+of SQL statements. Run from app/ with `python -m unittest discover tests`.
+"""
+
+import os
+import tempfile
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+
+# Configure a throwaway database and strict loading before the app is imported;
+# main.py resolves templates and static files relative to the app directory
+_DB_DIR = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["RAISE_ON_LAZY_LOAD"] = "1"
+os.chdir(Path(__file__).resolve().parent.parent)
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import main
+from app.models.database import Base, engine
+
+DASHBOARD_QUERY_BUDGET = 2  # Player with session and guild, then the roster
+
+@contextmanager
+def count_queries():
+    """Collect every SQL statement executed on the engine inside the block"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+class DashboardQueryCountTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        Base.metadata.create_all(bind=engine)
+        cls.client = TestClient(main.app)
+        response = cls.client.post("/api/auth/register", data={
+            "email": "ceo@guildedin.com",
+            "username": "ceo",
+            "display_name": "CEO",
+            "guild_name": "TechCorp Guild",
+            "corporate_class": "hr_manager",
+            "password": "password",
+            "confirm_password": "password",
+        })
+        assert response.status_code == 204, response.text
+    
+    def test_dashboard_stays_within_query_budget(self):
+        with count_queries() as statements:
+            response = self.client.get("/dashboard")
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(statements), DASHBOARD_QUERY_BUDGET, statements)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,41 +3,70 @@
 Quick verification script to show the seeded Skills and Traits
 """
 
+import sys
+from itertools import groupby
+from sqlalchemy import select, func
+from app.models import load_all
 from app.models.database import SessionLocal
-from app.models.adventurer import Skill, Trait
+from app.models.adventurer import Skill, Trait, ALL_POSITIONS, mask_positions
+
+# Display label for every possible position mask, indexed by the mask value
+POSITION_LABELS = tuple(
+    "Any" if mask == ALL_POSITIONS else ",".join(map(str, mask_positions(mask)))
+    for mask in range(ALL_POSITIONS + 1)
+)
+
+def sample_rows(db, group_column, *columns, per_group=3):
+    """First rows of each group plus the table total, in a single query"""
+    id_column = group_column.table.c.id
+    ranked = select(
+        group_column.label("group"),
+        *columns,
+        func.row_number().over(partition_by=group_column, order_by=id_column).label("rn"),
+        # Groups are listed in order of first appearance, as the DISTINCT queries did
+        func.min(id_column).over(partition_by=group_column).label("first_id"),
+        func.count().over().label("total")
+    ).subquery()
+    return db.execute(
+        select(ranked).where(ranked.c.rn <= per_group).order_by(ranked.c.first_id, ranked.c.rn)
+    ).all()
 
 def verify_skills_traits():
+    load_all()
     db = SessionLocal()
     try:
-        # Count totals
-        skill_count = db.query(Skill).count()
-        trait_count = db.query(Trait).count()
+        # Sample rows per type, with the table totals from the same queries
+        skill_rows = sample_rows(db, Skill.skill_type, Skill.name, Skill.usable_positions, Skill.target_type)
+        trait_rows = sample_rows(db, Trait.effect_type, Trait.name, Trait.rarity)
+        skill_count = skill_rows[0].total if skill_rows else 0
+        trait_count = trait_rows[0].total if trait_rows else 0
         
-        print(f"📊 Database Contents:")
-        print(f"   Skills: {skill_count}")
-        print(f"   Traits: {trait_count}")
-        print()
+        # Build the whole report and write it in one call instead of a print per line
+        lines = [
+            "📊 Database Contents:\n",
+            f"   Skills: {skill_count}\n",
+            f"   Traits: {trait_count}\n",
+            "\n",
+        ]
         
         # Show skill examples by type
-        print("⚔️ Sample Skills by Type:")
-        skill_types = db.query(Skill.skill_type).distinct().all()
-        for (skill_type,) in skill_types:
-            skills = db.query(Skill).filter(Skill.skill_type == skill_type).limit(3).all()
-            print(f"   {skill_type.upper()}:")
+        lines.append("⚔️ Sample Skills by Type:\n")
+        for skill_type, skills in groupby(skill_rows, key=lambda row: row.group):
+            lines.append(f"   {skill_type.upper()}:\n")
             for skill in skills:
-                positions = skill.usable_positions if skill.usable_positions != "1,2,3,4" else "Any"
-                print(f"     • {skill.name} (positions: {positions}, targets: {skill.target_type})")
-        print()
+                positions = POSITION_LABELS[skill.usable_positions]
+                lines.append(f"     • {skill.name} (positions: {positions}, targets: {skill.target_type})\n")
+        lines.append("\n")
         
         # Show trait examples by effect type
-        print("✨ Sample Traits by Effect:")
-        effect_types = db.query(Trait.effect_type).distinct().all()
-        for (effect_type,) in effect_types:
-            traits = db.query(Trait).filter(Trait.effect_type == effect_type).limit(3).all()
-            print(f"   {effect_type.upper()}:")
+        lines.append("✨ Sample Traits by Effect:\n")
+        for effect_type, traits in groupby(trait_rows, key=lambda row: row.group):
+            lines.append(f"   {effect_type.upper()}:\n")
             for trait in traits:
                 rarity = f"({trait.rarity})" if trait.rarity else ""
-                print(f"     • {trait.name} {rarity}")
+                lines.append(f"     • {trait.name} {rarity}\n")
+        
+        sys.stdout.write("".join(lines))
                 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -45,4 +74,4 @@ def verify_skills_traits():
         db.close()
 
 if __name__ == "__main__":
-    verify_skills_traits()
\ No newline at end of file
+    verify_skills_traits()